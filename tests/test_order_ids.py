@@ -0,0 +1,13 @@
+from trader.order_ids import mint_client_oid, new_trace_id
+
+
+def test_mint_client_oid_is_unique_within_same_millisecond() -> None:
+    ids = [mint_client_oid("risk-reduce") for _ in range(100)]
+    assert len(set(ids)) == 100
+    assert all(i.startswith("risk-reduce-") for i in ids)
+
+
+def test_new_trace_id_matches_uuid_hex_shape_and_refills() -> None:
+    ids = [new_trace_id() for _ in range(3000)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) == 12 and int(i, 16) >= 0 for i in ids)
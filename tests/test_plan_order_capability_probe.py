@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from trader.alerts import AlertManager
@@ -5,7 +6,10 @@ from trader.bitget_client import BitgetClient
 from trader.config import AppConfig, BitgetConfig
 from trader.notifier import Notifier
 from trader.state import StateStore
-from trader.startup_probe import probe_plan_order_capability_on_startup
+from trader.startup_probe import (
+    probe_plan_order_capability_in_background,
+    probe_plan_order_capability_on_startup,
+)
 from trader.store import SQLiteStore
 
 
@@ -70,8 +74,8 @@ def test_probe_plan_orders_capability_handles_not_found_and_network_errors() ->
     assert (state_param["expires_at"] - state_param["ts"]) <= 30
 
 
-def test_startup_probe_fallbacks_to_local_guard_with_alert_only(tmp_path) -> None:
-    cfg = AppConfig.model_validate(
+def _probe_config() -> AppConfig:
+    return AppConfig.model_validate(
         {
             "dry_run": True,
             "listener": {"mode": "web_preview"},
@@ -107,6 +111,10 @@ def test_startup_probe_fallbacks_to_local_guard_with_alert_only(tmp_path) -> Non
             "monitor": {"enabled": True},
         }
     )
+
+
+def test_startup_probe_fallbacks_to_local_guard_with_alert_only(tmp_path) -> None:
+    cfg = _probe_config()
     store = SQLiteStore(str(tmp_path / "probe.db"))
     alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
     runtime_state = StateStore()
@@ -132,3 +140,27 @@ def test_startup_probe_fallbacks_to_local_guard_with_alert_only(tmp_path) -> Non
         "SELECT type FROM events WHERE type='PLAN_ORDER_FALLBACK' ORDER BY id DESC LIMIT 1"
     ).fetchone()
     assert row is not None
+
+
+def test_background_startup_probe_applies_fallback_on_event_loop(tmp_path) -> None:
+    cfg = _probe_config()
+    store = SQLiteStore(str(tmp_path / "probe_bg.db"))
+    alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
+    client = BitgetClient(cfg.bitget)
+    client.probe_plan_orders_capability = lambda force=True: {  # type: ignore[method-assign]
+        "supported": False,
+        "reason": "endpoint_not_found",
+        "ts": 1,
+        "expires_at": 301,
+    }
+
+    asyncio.run(
+        probe_plan_order_capability_in_background(
+            config=cfg,
+            bitget=client,
+            alerts=alerts,
+            runtime_state=StateStore(),
+        )
+    )
+
+    assert cfg.risk.stoploss.sl_order_type == "local_guard"
@@ -97,3 +97,16 @@ def test_private_channel_reply_resolution_supports_cross_chat_reply_peer(tmp_pat
     )
     assert discussion_reply.thread_id == root.thread_id
     assert discussion_reply.is_root is False
+
+
+def test_private_channel_threading_ascii_reply_and_fullwidth_root(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "threading_ascii.db"))
+    router = TradeThreadRouter(store)
+    store.record_thread_message(thread_id=3001, chat_id=0, message_id=3001, is_root=True, kind="ROOT")
+
+    reply = router.resolve(message_id=3002, text="#BTC SL moved to entry", reply_to_msg_id=3001)
+    assert (reply.thread_id, reply.is_root) == (3001, False)
+
+    # Full-width banner spacing still normalizes (NFKC) into a root match.
+    root = router.resolve(message_id=3003, text="交易　信號 #BTC", reply_to_msg_id=None)
+    assert (root.thread_id, root.is_root, root.reason) == (3003, True, "root_keyword_detected")
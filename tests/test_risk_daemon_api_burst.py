@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
 
 from trader.alerts import AlertManager
 from trader.config import AppConfig
@@ -86,3 +87,16 @@ def test_api_error_burst_emits_once_until_recovered(tmp_path) -> None:
         "SELECT id FROM events WHERE type='API_ERROR_BURST_RECOVERED' ORDER BY id DESC LIMIT 1"
     ).fetchone()
     assert recover is not None
+
+
+def test_api_errors_in_window_prunes_expired_entries() -> None:
+    state = StateStore()
+    now = datetime.now(timezone.utc)
+    state.register_api_error(now - timedelta(seconds=300))
+    state.register_api_error(now - timedelta(seconds=200))
+    state.register_api_error(now - timedelta(seconds=30))
+    state.register_api_error(now)
+
+    assert state.api_errors_in_window(120, now=now) == 2
+    assert len(state.api_error_timestamps) == 2
+    assert state.api_errors_in_window(10, now=now) == 1
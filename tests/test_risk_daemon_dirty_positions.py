@@ -0,0 +1,96 @@
+import asyncio
+import logging
+
+from trader.alerts import AlertManager
+from trader.config import AppConfig
+from trader.kill_switch import KillSwitch
+from trader.notifier import Notifier
+from trader.risk_daemon import RiskDaemon
+from trader.state import PositionState, StateStore, utc_now
+from trader.store import SQLiteStore
+
+
+class FakeBitgetNoop:
+    def protective_close_position(self, symbol: str, side: str, size: float):  # noqa: ARG002
+        return {"ok": True}
+
+
+def _config() -> AppConfig:
+    return AppConfig.model_validate(
+        {
+            "dry_run": True,
+            "listener": {"mode": "web_preview"},
+            "telegram": {"session_name": "s", "channel": "@IvanCryptotalk"},
+            "bitget": {
+                "base_url": "https://api.bitget.com",
+                "api_key": "",
+                "api_secret": "",
+                "passphrase": "",
+                "product_type": "USDT-FUTURES",
+            },
+            "filters": {
+                "symbol_policy": "ALLOWLIST",
+                "symbol_whitelist": ["BTCUSDT"],
+                "symbol_blacklist": [],
+                "require_exchange_symbol": False,
+                "min_usdt_volume_24h": None,
+                "max_leverage": 10,
+                "allow_sides": ["LONG", "SHORT"],
+                "max_signal_age_seconds": 20,
+                "leverage_over_limit_action": "CLAMP",
+            },
+            "risk": {
+                "account_risk_per_trade": 0.003,
+                "max_notional_per_trade": 200,
+                "default_stop_loss_pct": 0.006,
+                "assumed_equity_usdt": 1000,
+                "max_liquidation_distance_pct": 0.05,
+            },
+            "execution": {"close_on_invariant_violation": False},
+            "logging": {"level": "INFO", "file": "trader.log", "rich": False},
+            "monitor": {"enabled": True, "poll_intervals": {"risk_daemon_full_sweep_ticks": 10}},
+        }
+    )
+
+
+def test_invariants_only_rechecked_for_dirty_positions(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "dirty.db"))
+    alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
+    state = StateStore()
+    state.set_positions(
+        [
+            PositionState(
+                symbol="BTCUSDT",
+                side="long",
+                size=1.0,
+                entry_price=100,
+                mark_price=100,
+                liq_price=98,
+                pnl=0,
+                leverage=5,
+                margin_mode="isolated",
+                timestamp=utc_now(),
+            )
+        ]
+    )
+    daemon = RiskDaemon(
+        config=_config(),
+        bitget=FakeBitgetNoop(),
+        state=state,
+        store=store,
+        alerts=alerts,
+        kill_switch=KillSwitch(store=store, file_path=str(tmp_path / "NO_SWITCH")),
+    )
+
+    def _liq_alerts() -> int:
+        return store.conn.execute("SELECT COUNT(1) FROM events WHERE type='LIQUIDATION_DISTANCE_RISK'").fetchone()[0]
+
+    asyncio.run(daemon.tick_once())
+    assert _liq_alerts() == 1
+
+    asyncio.run(daemon.tick_once())
+    assert _liq_alerts() == 1
+
+    state.set_mark_price("BTCUSDT", 99.0)
+    asyncio.run(daemon.tick_once())
+    assert _liq_alerts() == 2
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+
+from trader.alerts import AlertManager
+from trader.config import AppConfig
+from trader.kill_switch import KillSwitch
+from trader.notifier import Notifier
+from trader.risk_daemon import RiskDaemon
+from trader.state import PositionState, StateStore, utc_now
+from trader.store import SQLiteStore
+
+
+class FakeBitgetFailingReduce:
+    def __init__(self) -> None:
+        self.place_order_calls = 0
+
+    def place_order(self, **kwargs):  # noqa: ANN003
+        self.place_order_calls += 1
+        raise RuntimeError("bitget unavailable")
+
+
+def _config() -> AppConfig:
+    return AppConfig.model_validate(
+        {
+            "dry_run": False,
+            "listener": {"mode": "web_preview"},
+            "telegram": {"session_name": "s", "channel": "@IvanCryptotalk"},
+            "bitget": {
+                "base_url": "https://api.bitget.com",
+                "api_key": "",
+                "api_secret": "",
+                "passphrase": "",
+                "product_type": "USDT-FUTURES",
+            },
+            "filters": {
+                "symbol_policy": "ALLOWLIST",
+                "symbol_whitelist": ["BTCUSDT"],
+                "symbol_blacklist": [],
+                "require_exchange_symbol": False,
+                "min_usdt_volume_24h": None,
+                "max_leverage": 10,
+                "allow_sides": ["LONG", "SHORT"],
+                "max_signal_age_seconds": 20,
+                "leverage_over_limit_action": "CLAMP",
+            },
+            "risk": {
+                "account_risk_per_trade": 0.003,
+                "max_notional_per_trade": 200,
+                "default_stop_loss_pct": 0.006,
+                "assumed_equity_usdt": 1000,
+                "circuit_breaker": {
+                    "rest_failure_threshold": 2,
+                    "rest_cooldown_seconds": 60,
+                },
+            },
+            "logging": {"level": "INFO", "file": "trader.log", "rich": False},
+            "monitor": {"enabled": True},
+        }
+    )
+
+
+def test_risk_reduce_skips_rest_after_repeated_failures(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "reduce_cb.db"))
+    alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
+    bitget = FakeBitgetFailingReduce()
+    daemon = RiskDaemon(
+        config=_config(),
+        bitget=bitget,
+        state=StateStore(),
+        store=store,
+        alerts=alerts,
+        kill_switch=KillSwitch(store=store, file_path=str(tmp_path / "NO_SWITCH")),
+    )
+    position = PositionState(
+        symbol="BTCUSDT",
+        side="long",
+        size=1.0,
+        entry_price=100.0,
+        mark_price=99.5,
+        liq_price=99.0,
+        pnl=None,
+        leverage=10,
+        margin_mode="crossed",
+        timestamp=utc_now(),
+    )
+
+    for _ in range(3):
+        assert asyncio.run(daemon._reduce_position_once(position, reason="test")) is False
+
+    assert bitget.place_order_calls == 2
+    skipped = store.conn.execute(
+        "SELECT COUNT(1) FROM reconciler_actions WHERE action='RISK_REDUCE_SKIPPED_CB_OPEN'"
+    ).fetchone()
+    assert skipped[0] == 1
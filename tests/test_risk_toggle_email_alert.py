@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from trader.alerts import AlertManager
 from trader.config import AppConfig
@@ -198,6 +199,106 @@ def test_order_submitted_email_is_deduped(monkeypatch, tmp_path) -> None:
     assert len(_FakeSMTP.sent_messages) == 1
 
 
+def test_batched_alerts_coalesce_into_single_email(monkeypatch, tmp_path) -> None:
+    cfg = _config()
+    cfg.alerts.email.send_on = ["LIQUIDATION_DISTANCE_RISK"]
+    cfg.alerts.email.dedupe_seconds = 0
+    store = SQLiteStore(str(tmp_path / "batched_alerts.db"))
+    notifier = Notifier(logging.getLogger("test"))
+    sender = SMTPAlertSender(cfg.alerts.email)
+    alerts = AlertManager(notifier=notifier, store=store, logger=logging.getLogger("test"), email_sender=sender)
+
+    _FakeSMTP.sent_messages.clear()
+    monkeypatch.setenv("SMTP_PASS", "dummy")
+    monkeypatch.setattr("smtplib.SMTP", _FakeSMTP)
+    with alerts.batch():
+        for _ in range(3):
+            alerts.warn("LIQUIDATION_DISTANCE_RISK", "liquidation distance is too close", {"symbol": "BTCUSDT"})
+        assert _FakeSMTP.sent_messages == []
+
+    assert len(_FakeSMTP.sent_messages) == 1
+    assert "本轮出现次数: 3" in _FakeSMTP.sent_messages[0].get_content()
+    rows = store.conn.execute("SELECT COUNT(1) FROM events WHERE type='LIQUIDATION_DISTANCE_RISK'").fetchone()
+    assert rows[0] == 3
+
+
+class _RecordingNotifier:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.fail_on = fail_on
+        self.sent: list[str] = []
+
+    def _send(self, text: str) -> None:
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("notifier down")
+        self.sent.append(text)
+
+    info = warning = error = _send
+
+
+def test_critical_alerts_bypass_the_batch(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "batched_critical.db"))
+    notifier = _RecordingNotifier()
+    alerts = AlertManager(notifier=notifier, store=store, logger=logging.getLogger("test"))
+
+    with alerts.batch():
+        alerts.warn("LIQUIDATION_DISTANCE_RISK", "liquidation distance is too close", {"symbol": "BTCUSDT"})
+        alerts.critical("LOCAL_GUARD_TRIGGERED", "local guard stop-loss triggered", {"symbol": "BTCUSDT"})
+        assert len(notifier.sent) == 1 and "local guard" in notifier.sent[0]
+
+    assert len(notifier.sent) == 2 and "liquidation" in notifier.sent[1]
+
+
+def test_batch_flush_continues_after_a_delivery_failure(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "batched_failure.db"))
+    notifier = _RecordingNotifier(fail_on="first")
+    alerts = AlertManager(notifier=notifier, store=store, logger=logging.getLogger("test"))
+
+    with alerts.batch():
+        alerts.warn("API_ERROR_BURST", "first alert", {"symbol": "BTCUSDT"})
+        alerts.warn("LIQUIDATION_DISTANCE_RISK", "second alert", {"symbol": "ETHUSDT"})
+
+    assert len(notifier.sent) == 1 and "second alert" in notifier.sent[0]
+
+
+def test_batch_only_defers_alerts_from_the_batching_task(monkeypatch, tmp_path) -> None:
+    cfg = _config()
+    cfg.alerts.email.send_on = ["LIQUIDATION_DISTANCE_RISK", "ORDER_SUBMITTED"]
+    cfg.alerts.email.dedupe_seconds = 0
+    store = SQLiteStore(str(tmp_path / "batched_tasks.db"))
+    notifier = Notifier(logging.getLogger("test"))
+    sender = SMTPAlertSender(cfg.alerts.email)
+    alerts = AlertManager(notifier=notifier, store=store, logger=logging.getLogger("test"), email_sender=sender)
+
+    _FakeSMTP.sent_messages.clear()
+    monkeypatch.setenv("SMTP_PASS", "dummy")
+    monkeypatch.setattr("smtplib.SMTP", _FakeSMTP)
+
+    async def scenario() -> None:
+        tick_paused = asyncio.Event()
+        other_done = asyncio.Event()
+
+        async def batched_tick() -> None:
+            with alerts.batch():
+                alerts.warn("LIQUIDATION_DISTANCE_RISK", "liquidation distance is too close", {"symbol": "BTCUSDT"})
+                tick_paused.set()
+                await other_done.wait()
+                # The other task's alert went out on its own, not into this batch.
+                assert len(_FakeSMTP.sent_messages) == 1
+
+        async def other_component() -> None:
+            await tick_paused.wait()
+            alerts.info("ORDER_SUBMITTED", "order submitted to exchange", {"symbol": "ETHUSDT"})
+            other_done.set()
+
+        await asyncio.gather(batched_tick(), other_component())
+
+    asyncio.run(scenario())
+
+    assert len(_FakeSMTP.sent_messages) == 2
+    assert "ETHUSDT" in _FakeSMTP.sent_messages[0].get_content()
+    assert "BTCUSDT" in _FakeSMTP.sent_messages[1].get_content()
+
+
 def test_api_error_burst_email_dedupes_when_count_changes(monkeypatch, tmp_path) -> None:
     cfg = _config()
     cfg.alerts.email.send_on = ["API_ERROR_BURST"]
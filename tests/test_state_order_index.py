@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from trader.state import OrderState, StateStore, record_payload, utc_now
+
+
+def _order(symbol: str, client_oid: str | None, order_id: str | None = None, *, status: str = "NEW") -> OrderState:
+    return OrderState(
+        symbol=symbol,
+        side="buy",
+        status=status,
+        filled=0.0,
+        quantity=1.0,
+        avg_price=None,
+        reduce_only=True,
+        trade_side="close",
+        purpose="sl",
+        timestamp=utc_now(),
+        client_order_id=client_oid,
+        order_id=order_id,
+        trigger_price=90.0,
+    )
+
+
+def test_orders_for_symbol_tracks_replacements_and_clear() -> None:
+    state = StateStore()
+    state.upsert_order(_order("btcusdt", "sl-1"))
+    state.upsert_order(_order("ETHUSDT", "sl-2"))
+    # Same client oid re-upserted with an exchange id replaces the old object.
+    state.upsert_order(_order("BTCUSDT", "sl-1", "ex-1"))
+    state.upsert_order(_order("BTCUSDT", None, "ex-manual"))
+
+    btc = state.orders_for_symbol("BTCUSDT")
+    assert sorted((o.client_order_id or "", o.order_id or "") for o in btc) == [("", "ex-manual"), ("sl-1", "ex-1")]
+    assert state.has_valid_stop_loss("BTCUSDT", "long")
+
+    state.clear_orders_for_symbol("btcusdt")
+
+    assert state.orders_for_symbol("BTCUSDT") == []
+    assert not state.has_valid_stop_loss("BTCUSDT", "long")
+    assert set(state.orders_by_client_id) == {"sl-2"}
+    assert state.orders_by_exchange_id == {}
+    assert [o.client_order_id for o in state.orders_for_symbol("ETHUSDT")] == ["sl-2"]
+
+
+def test_pending_orders_cache_invalidated_by_status_change() -> None:
+    state = StateStore()
+    state.upsert_order(_order("BTCUSDT", "sl-1"))
+    assert [o.client_order_id for o in state.pending_orders()] == ["sl-1"]
+
+    state.mark_order_status(status="canceled", client_order_id="sl-1")
+    assert state.pending_orders() == []
+
+    state.upsert_order(_order("ETHUSDT", "sl-2"))
+    assert [o.client_order_id for o in state.pending_orders()] == ["sl-2"]
+
+
+def test_record_payload_omits_cached_lookup_keys() -> None:
+    payload = record_payload(_order("btcusdt", "sl-1", "ex-1", status="FILLED"))
+
+    assert payload["symbol"] == "btcusdt"
+    assert payload["client_order_id"] == "sl-1"
+    assert payload["status"] == "FILLED"
+    for cached in ("symbol_key", "status_key", "side_key", "purpose_key", "trade_side_key", "is_terminal"):
+        assert cached not in payload
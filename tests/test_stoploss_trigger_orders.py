@@ -177,3 +177,84 @@ def test_local_guard_trigger_report_only_mode_does_not_close_position(tmp_path)
         "SELECT action FROM reconciler_actions WHERE action='LOCAL_GUARD_TRIGGER_REPORT_ONLY' ORDER BY id DESC LIMIT 1"
     ).fetchone()
     assert row is not None
+
+
+def test_local_guards_fired_together_are_closed_concurrently(tmp_path) -> None:
+    import threading
+
+    class ConcurrentBitget(FakeBitget):
+        def __init__(self) -> None:
+            super().__init__()
+            self.barrier = threading.Barrier(2, timeout=5)
+
+        def protective_close_position(self, symbol: str, side: str, size: float):
+            # Both closes must be in flight at once to pass the barrier.
+            self.barrier.wait()
+            if symbol == "ETHUSDT":
+                raise RuntimeError("close rejected")
+            return super().protective_close_position(symbol, side, size)
+
+    cfg = _config()
+    store = SQLiteStore(str(tmp_path / "guard_concurrent.db"))
+    alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
+    state = StateStore()
+    bitget = ConcurrentBitget()
+    manager = StopLossManager(config=cfg, bitget=bitget, state=state, store=store, alerts=alerts)
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        state.register_local_guard_stop(
+            LocalGuardStop(
+                symbol=symbol,
+                side="long",
+                trigger_price=99.0,
+                size=1.0,
+                reason="test_guard",
+                created_at=utc_now(),
+            )
+        )
+        state.set_price_snapshot(symbol=symbol, mark=98.5, last=98.5, bid=98.4, ask=98.6, timestamp=utc_now())
+
+    manager.process_local_guards()
+
+    assert bitget.close_calls == 1
+    rows = store.conn.execute(
+        "SELECT symbol, action FROM reconciler_actions WHERE action LIKE 'LOCAL_GUARD_TRIGGER_%' ORDER BY symbol"
+    ).fetchall()
+    assert [(r["symbol"], r["action"]) for r in rows] == [
+        ("BTCUSDT", "LOCAL_GUARD_TRIGGER_CLOSE"),
+        ("ETHUSDT", "LOCAL_GUARD_TRIGGER_FAILED"),
+    ]
+    assert [g.symbol for g in state.active_local_guards()] == ["ETHUSDT"]
+
+
+def test_local_guard_trigger_alert_is_raised_before_the_close(tmp_path) -> None:
+    cfg = _config()
+    store = SQLiteStore(str(tmp_path / "guard_alert_first.db"))
+    alerts = AlertManager(Notifier(logging.getLogger("test")), store, logging.getLogger("test"))
+    state = StateStore()
+
+    class AlertCheckingBitget(FakeBitget):
+        def protective_close_position(self, symbol: str, side: str, size: float):
+            self.alerted_before_close = store.conn.execute(
+                "SELECT COUNT(*) FROM events WHERE type='LOCAL_GUARD_TRIGGERED'"
+            ).fetchone()[0]
+            raise RuntimeError("close rejected")
+
+    bitget = AlertCheckingBitget()
+    manager = StopLossManager(config=cfg, bitget=bitget, state=state, store=store, alerts=alerts)
+    state.register_local_guard_stop(
+        LocalGuardStop(
+            symbol="BTCUSDT",
+            side="long",
+            trigger_price=99.0,
+            size=1.0,
+            reason="test_guard",
+            created_at=utc_now(),
+        )
+    )
+    state.set_price_snapshot(symbol="BTCUSDT", mark=98.5, last=98.5, bid=98.4, ask=98.6, timestamp=utc_now())
+
+    manager.process_local_guards()
+
+    assert bitget.alerted_before_close == 1
+    events = store.conn.execute("SELECT type FROM events WHERE type LIKE 'LOCAL_GUARD_%' ORDER BY id").fetchall()
+    assert [r["type"] for r in events] == ["LOCAL_GUARD_TRIGGERED", "LOCAL_GUARD_TRIGGER_FAILED"]
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import trader.store as store_module
+from trader.models import EntrySignal, EntryType, ManageAction, NonSignal, ParsedKind, Side
+from trader.store import SQLiteStore
+
+
+def _count_actions(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return int(conn.execute("SELECT COUNT(1) FROM reconciler_actions").fetchone()[0])
+    finally:
+        conn.close()
+
+
+def test_deferred_commits_publish_rows_on_outermost_exit(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    store = SQLiteStore(db_path)
+
+    with store.deferred_commits():
+        first = store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="A")
+        with store.deferred_commits():
+            store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="B")
+        assert first > 0
+        # Visible on the writer connection, not yet committed for other readers.
+        assert store.conn.execute("SELECT COUNT(1) FROM reconciler_actions").fetchone()[0] == 2
+        assert _count_actions(db_path) == 0
+
+    assert _count_actions(db_path) == 2
+
+    store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="C")
+    assert _count_actions(db_path) == 3
+    store.close()
+
+
+def test_deferred_commits_block_other_thread_writes_until_exit(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    store = SQLiteStore(db_path)
+
+    def other_write() -> None:
+        store.record_reconciler_action(symbol="ETHUSDT", order_id=None, client_order_id=None, action="B")
+
+    worker = threading.Thread(target=other_write)
+    with store.deferred_commits():
+        store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="A")
+        worker.start()
+        worker.join(timeout=0.2)
+        # The other thread's commit must neither run nor publish this batch early.
+        assert worker.is_alive()
+        assert _count_actions(db_path) == 0
+    worker.join()
+
+    assert _count_actions(db_path) == 2
+    store.close()
+
+
+def test_transaction_rolls_back_all_writes_on_error(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    store = SQLiteStore(db_path)
+
+    try:
+        with store.transaction():
+            store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="A")
+            store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert _count_actions(db_path) == 0
+    assert store.conn.execute("SELECT COUNT(1) FROM message_state").fetchone()[0] == 0
+
+    first = store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+    assert first.version == 1 and not first.duplicate
+    assert store.conn.execute("SELECT COUNT(1) FROM message_versions").fetchone()[0] == 1
+    store.close()
+
+
+def test_failed_transaction_nested_in_deferred_commits_persists_nothing(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    store = SQLiteStore(db_path)
+
+    try:
+        with store.deferred_commits():
+            store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="A")
+            with store.transaction():
+                store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="B")
+                raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert _count_actions(db_path) == 0
+    assert store.conn.execute("SELECT COUNT(1) FROM reconciler_actions").fetchone()[0] == 0
+
+    store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="C")
+    assert _count_actions(db_path) == 1
+    store.close()
+
+
+def test_transaction_rollback_not_undone_by_other_thread_commit(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    store = SQLiteStore(db_path)
+    worker = threading.Thread(target=lambda: store.set_system_flag("b", "1"))
+
+    try:
+        with store.transaction():
+            store.record_reconciler_action(symbol="BTCUSDT", order_id=None, client_order_id=None, action="A")
+            worker.start()
+            worker.join(timeout=0.2)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    worker.join()
+
+    assert _count_actions(db_path) == 0
+    assert store.get_system_flag("b") == "1"
+    store.close()
+
+
+def test_reader_connection_sees_committed_and_own_deferred_writes(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+    now = datetime.now(timezone.utc)
+
+    assert store.within_cooldown("BTCUSDT", "long", 60, now) is False
+    with store.deferred_commits():
+        store.record_execution(1, 10, 1, "ENTRY", "BTCUSDT", "long", "EXECUTED", None, None)
+        # Uncommitted row is only visible through the writer connection.
+        assert store.within_cooldown("BTCUSDT", "long", 60, now) is True
+    assert store.within_cooldown("BTCUSDT", "long", 60, now) is True
+
+    seen: list[bool] = []
+    worker = threading.Thread(target=lambda: seen.append(store.within_cooldown("BTCUSDT", "long", 60, now)))
+    worker.start()
+    worker.join()
+    assert seen == [True]
+    store.close()
+
+
+def test_record_messages_bulk_matches_sequential_semantics(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+
+    results = store.record_messages_bulk(
+        [
+            (1, 10, "long btc", False, None),
+            (1, 10, "long btc", True, None),
+            (1, 10, "long btc sl 90", True, None),
+            (1, 11, "short eth", False, None),
+        ]
+    )
+
+    assert [(r.duplicate, r.version) for r in results] == [(False, 1), (True, 1), (False, 2), (False, 1)]
+    assert store.conn.execute("SELECT COUNT(1) FROM message_versions").fetchone()[0] == 3
+    store.close()
+
+
+def test_llm_parse_cache_served_from_memory_after_first_read(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    writer = SQLiteStore(db_path)
+    writer.save_llm_parse(1, 10, 1, "h1", "openai", "m", "raw", "raw", {"kind": "ENTRY_SIGNAL", "confidence": 0.9})
+    writer.close()
+
+    store = SQLiteStore(db_path)
+    first = store.get_llm_parse_cache(1, 10, 1, "h1")
+    assert first == {"kind": "ENTRY_SIGNAL", "confidence": 0.9}
+    store.conn.execute("DELETE FROM llm_parses")
+    store.conn.commit()
+    assert store.get_llm_parse_cache(1, 10, 1, "h1") is first
+    assert store.get_llm_parse_cache(1, 10, 1, "other") is None
+    store.close()
+
+
+def test_llm_parse_saved_in_rolled_back_transaction_is_not_cached(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+
+    try:
+        with store.transaction():
+            store.save_llm_parse(1, 10, 1, "h1", "openai", "m", "raw", "raw", {"kind": "ENTRY_SIGNAL", "confidence": 0.9})
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert store.get_llm_parse_cache(1, 10, 1, "h1") is None
+    store.close()
+
+
+def test_record_parsed_signal_extracts_type_symbol_side(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+    entry = EntrySignal(
+        kind=ParsedKind.ENTRY_SIGNAL,
+        raw_text="#BTC long",
+        symbol="BTCUSDT",
+        quote="USDT",
+        side=Side.LONG,
+        leverage=10,
+        entry_type=EntryType.LIMIT,
+        entry_low=100.0,
+        entry_high=101.0,
+    )
+    store.record_parsed_signal(1, 10, 1, entry)
+    store.record_parsed_signal(1, 11, 1, NonSignal(kind=ParsedKind.NON_SIGNAL, raw_text="gm", note="chatter"))
+
+    rows = [tuple(r) for r in store.conn.execute("SELECT signal_type, symbol, side FROM parsed_signals ORDER BY id")]
+    assert rows == [("ENTRY_SIGNAL", "BTCUSDT", "LONG"), ("NON_SIGNAL", None, None)]
+    assert store.get_last_entry_symbol(1) == "BTCUSDT"
+    store.close()
+
+
+def test_schema_migration_adds_columns_once_and_stamps_user_version(tmp_path) -> None:
+    db_path = str(tmp_path / "trader.db")
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, level TEXT NOT NULL, "
+        "msg TEXT NOT NULL, payload_json TEXT, trace_id TEXT, created_at TEXT NOT NULL)"
+    )
+    legacy.execute(
+        "CREATE TABLE executions (id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id INTEGER NOT NULL, "
+        "message_id INTEGER NOT NULL, version INTEGER NOT NULL, action_type TEXT NOT NULL, symbol TEXT, side TEXT, "
+        "status TEXT NOT NULL, reason TEXT, intent_json TEXT, created_at TEXT NOT NULL)"
+    )
+    legacy.execute(
+        "INSERT INTO executions(chat_id, message_id, version, action_type, symbol, side, status, created_at) "
+        "VALUES(1, 10, 1, 'ENTRY', 'BTCUSDT', 'long', 'EXECUTED', '2026-03-02T03:08:49.250000+00:00')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    store = SQLiteStore(db_path)
+    cols = {str(r[1]) for r in store.conn.execute("PRAGMA table_info(events)")}
+    assert {"reason", "thread_id"} <= cols
+    backfilled = datetime(2026, 3, 2, 3, 8, 49, 250000, tzinfo=timezone.utc)
+    assert store.conn.execute("SELECT created_at_ms FROM executions").fetchone()[0] == int(backfilled.timestamp() * 1000)
+    assert store.within_cooldown("BTCUSDT", "long", 60, backfilled.replace(second=59)) is True
+    assert store.within_cooldown("BTCUSDT", "long", 60, backfilled.replace(minute=10)) is False
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+    store.close()
+
+    SQLiteStore(db_path).close()
+
+
+def test_identical_resend_within_window_skips_last_seen_write(tmp_path, monkeypatch) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+    first = store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+    store.conn.execute("UPDATE message_state SET last_seen='sentinel'")
+    store.conn.commit()
+
+    again = store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+    assert (again.duplicate, again.version, again.text_hash) == (True, 1, first.text_hash)
+    assert store.conn.execute("SELECT last_seen FROM message_state").fetchone()[0] == "sentinel"
+
+    monkeypatch.setattr(store_module, "_LAST_SEEN_DEBOUNCE_SECONDS", 0.0)
+    store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+    assert store.conn.execute("SELECT last_seen FROM message_state").fetchone()[0] != "sentinel"
+
+    edited = store.record_message(chat_id=1, message_id=10, text="long btc sl 90", is_edit=True, event_time=None)
+    assert (edited.duplicate, edited.version) == (False, 2)
+    store.close()
+
+
+def test_nested_write_invalidates_resend_debounce(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+    store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=False, event_time=None)
+    store.record_messages_bulk([(1, 10, "long btc sl 90", True, None)])
+
+    back = store.record_message(chat_id=1, message_id=10, text="long btc", is_edit=True, event_time=None)
+    assert (back.duplicate, back.version) == (False, 3)
+    store.close()
+
+
+def test_dataclass_payload_with_oversized_int_serializes_as_object() -> None:
+    action = ManageAction(
+        kind=ParsedKind.MANAGE_ACTION,
+        raw_text="move sl to be",
+        symbol="BTCUSDT",
+        reduce_pct=None,
+        move_sl_to_be=True,
+        tp_price=None,
+        thread_id=2**70,
+    )
+
+    # orjson rejects ints beyond 64 bits, so this takes the stdlib fallback.
+    payload = json.loads(store_module._dumps(SQLiteStore._json(action)))
+
+    assert payload["thread_id"] == 2**70
+    assert payload["symbol"] == "BTCUSDT"
+    assert payload["move_sl_to_be"] is True
+
+
+def test_dumps_writes_the_same_document_with_and_without_orjson(monkeypatch) -> None:
+    payload = {
+        "at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "nan": float("nan"),
+        "inf": float("inf"),
+        "nested": [1.5, {"px": float("-inf")}],
+        7: "seven",
+    }
+
+    with_orjson = store_module._dumps(payload)
+    monkeypatch.setattr(store_module, "orjson", None)
+    stdlib = store_module._dumps(payload)
+
+    assert stdlib == with_orjson
+    assert json.loads(stdlib) == {
+        "at": "2026-01-01 00:00:00+00:00",
+        "nan": None,
+        "inf": None,
+        "nested": [1.5, {"px": None}],
+        "7": "seven",
+    }
+
+
+def test_within_cooldown_falls_back_to_created_at_for_legacy_rows(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "trader.db"))
+    store.record_execution(
+        chat_id=1,
+        message_id=10,
+        version=1,
+        action_type="ENTRY",
+        symbol="BTCUSDT",
+        side="buy",
+        status="EXECUTED",
+        reason=None,
+        intent=None,
+    )
+    # As left by an older binary, or a created_at the backfill could not parse.
+    store.conn.execute("UPDATE executions SET created_at_ms=NULL, created_at='2026-01-01T00:00:00+00:00'")
+    store.conn.commit()
+
+    assert store.within_cooldown("BTCUSDT", "buy", 60, datetime(2026, 1, 1, 0, 0, 30, tzinfo=timezone.utc))
+    assert not store.within_cooldown("BTCUSDT", "buy", 60, datetime(2026, 1, 1, 0, 5, tzinfo=timezone.utc))
+
+    store.conn.execute("UPDATE executions SET created_at='not a timestamp'")
+    store.conn.commit()
+    assert not store.within_cooldown("BTCUSDT", "buy", 60, datetime(2026, 1, 1, 0, 0, 30, tzinfo=timezone.utc))
+    store.close()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 
@@ -86,3 +87,79 @@ def test_reply_peer_to_chat_id_maps_channel_peer() -> None:
         channel_id = 3831751615
 
     assert TelegramPrivateListener._reply_peer_to_chat_id(_Peer()) == -1003831751615
+
+
+def test_per_chat_queues_keep_order_without_blocking_other_chats() -> None:
+    cfg = TelegramConfig(api_id=1, api_hash="x", channel_id=-1003831751615)
+    listener = _listener(cfg)
+
+    class _Event:
+        def __init__(self, chat_id: int, message_id: int) -> None:
+            self.chat_id = chat_id
+            self.message = message_id
+
+    async def scenario() -> list[tuple[int, int]]:
+        seen: list[tuple[int, int]] = []
+        release = asyncio.Event()
+
+        async def fake_dispatch(event, on_event, on_ignored, is_edit) -> None:
+            if (event.chat_id, event.message) == (1, 10):
+                await release.wait()
+            seen.append((event.chat_id, event.message))
+
+        listener._dispatch = fake_dispatch  # type: ignore[method-assign]
+        for chat_id, message_id in [(1, 10), (1, 11), (2, 20)]:
+            listener._enqueue(_Event(chat_id, message_id), on_event=None, on_ignored=None, is_edit=False)
+        await listener._queues[2].join()
+        assert seen == [(2, 20)]
+        release.set()
+        await listener._queues[1].join()
+        await listener.close()
+        return seen
+
+    assert asyncio.run(scenario()) == [(2, 20), (1, 10), (1, 11)]
+
+
+def test_close_drains_queues_then_stops_workers() -> None:
+    cfg = TelegramConfig(api_id=1, api_hash="x", channel_id=-1003831751615)
+    listener = _listener(cfg)
+
+    class _Event:
+        def __init__(self, chat_id: int, message_id: int) -> None:
+            self.chat_id = chat_id
+            self.message = message_id
+
+    async def scenario() -> tuple[list[int], list[asyncio.Task[None]]]:
+        seen: list[int] = []
+
+        async def fake_dispatch(event, on_event, on_ignored, is_edit) -> None:
+            await asyncio.sleep(0)
+            seen.append(event.message)
+
+        listener._dispatch = fake_dispatch  # type: ignore[method-assign]
+        for message_id in (10, 11, 12):
+            listener._enqueue(_Event(1, message_id), on_event=None, on_ignored=None, is_edit=False)
+        workers = list(listener._workers.values())
+        await listener.close(drain_timeout=5)
+        return seen, workers
+
+    seen, workers = asyncio.run(scenario())
+
+    assert seen == [10, 11, 12]
+    assert all(task.done() for task in workers)
+    assert listener._workers == {} and listener._queues == {}
+
+
+def test_extract_media_skips_sticker_download(tmp_path) -> None:
+    cfg = TelegramConfig(api_id=1, api_hash="x", channel_id=-1003831751615)
+    listener = TelegramPrivateListener(cfg, logger=logging.getLogger("test.telegram.forward"), media_dir=str(tmp_path))
+
+    class _Message:
+        media = object()
+        photo = None
+        sticker = object()
+
+        async def download_media(self, file: str) -> str:
+            raise AssertionError("sticker should not be downloaded")
+
+    assert asyncio.run(listener._extract_media(_Message())) == ("sticker", None)
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from datetime import datetime, timezone
 
@@ -111,3 +112,25 @@ def test_duplicate_edit_hash_detectable() -> None:
         is_root=True,
     )
     assert parsed.parsed.kind == ParsedKind.ENTRY_SIGNAL
+
+
+def test_legacy_sha256_message_hash_still_deduplicates() -> None:
+    store = SQLiteStore(":memory:")
+    text = "#BTC long 60000"
+    legacy = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    store.conn.execute(
+        "INSERT INTO message_state(chat_id, message_id, last_hash, latest_version, first_seen, last_seen) "
+        "VALUES(?,?,?,?,?,?)",
+        (-100123, 7, legacy, 1, "2026-01-01T00:00:00+00:00", "2026-01-01T00:00:00+00:00"),
+    )
+    store.conn.commit()
+
+    again = store.record_message(chat_id=-100123, message_id=7, text=text, is_edit=True, event_time=None)
+    assert again.duplicate is True
+    assert again.version == 1
+    assert again.text_hash == legacy
+
+    edited = store.record_message(chat_id=-100123, message_id=7, text=text + " tp 61000", is_edit=True, event_time=None)
+    assert edited.duplicate is False
+    assert edited.version == 2
+    assert len(edited.text_hash) == 32
@@ -1,6 +1,9 @@
+import asyncio
+import logging
 from pathlib import Path
 
-from trader.web_preview_listener import parse_posts_from_html
+from trader.config import ListenerConfig
+from trader.web_preview_listener import WebPreviewListener, parse_posts_from_html
 
 
 def test_parse_web_preview_html_fixture_extracts_fields() -> None:
@@ -18,3 +21,107 @@ def test_parse_web_preview_html_fixture_extracts_fields() -> None:
     assert latest.message_id == 12346
     assert "CYBER/USDT" in latest.text
     assert latest.image_url == "https://cdn4.cdn-telegram.org/file/sample_preview.jpg"
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, text: str = "", headers: dict[str, str] | None = None) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"http {self.status_code}")
+
+
+class _FakeSession:
+    def __init__(self, responses: list[_FakeResponse]) -> None:
+        self.responses = responses
+        self.sent_headers: list[dict[str, str]] = []
+
+    def get(self, url: str, headers: dict[str, str], timeout: int) -> _FakeResponse:
+        self.sent_headers.append(dict(headers))
+        return self.responses.pop(0)
+
+
+def test_fetch_posts_sends_validators_and_skips_parse_on_304() -> None:
+    html = Path("tests/fixtures/ivan_preview.html").read_text(encoding="utf-8")
+    listener = WebPreviewListener(ListenerConfig(mode="web_preview"), logger=logging.getLogger("test.web_preview"))
+    session = _FakeSession(
+        [
+            _FakeResponse(200, html, {"ETag": 'W/"abc"', "Last-Modified": "Mon, 02 Mar 2026 03:08:49 GMT"}),
+            _FakeResponse(304),
+        ]
+    )
+    listener.session = session  # type: ignore[assignment]
+
+    assert [p.message_id for p in listener._fetch_posts()] == [12345, 12346]
+    assert listener._fetch_posts() == []
+    assert session.sent_headers == [
+        {},
+        {"If-None-Match": 'W/"abc"', "If-Modified-Since": "Mon, 02 Mar 2026 03:08:49 GMT"},
+    ]
+
+
+def test_fetch_posts_reuses_parse_for_identical_body(monkeypatch) -> None:
+    html = Path("tests/fixtures/ivan_preview.html").read_text(encoding="utf-8")
+    listener = WebPreviewListener(ListenerConfig(mode="web_preview"), logger=logging.getLogger("test.web_preview"))
+    listener.session = _FakeSession([_FakeResponse(200, html), _FakeResponse(200, str(html))])  # type: ignore[assignment]
+
+    first = listener._fetch_posts()
+    monkeypatch.setattr("trader.web_preview_listener.parse_posts_from_html", lambda *_args, **_kwargs: [])
+    assert listener._fetch_posts() is first
+
+
+def test_parse_posts_skips_ids_at_or_below_min_message_id() -> None:
+    html = Path("tests/fixtures/ivan_preview.html").read_text(encoding="utf-8")
+
+    assert [p.message_id for p in parse_posts_from_html(html, min_message_id=12345)] == [12346]
+    assert parse_posts_from_html(html, min_message_id=12346) == []
+
+
+def test_regex_fallback_matches_soup_parse(monkeypatch) -> None:
+    html = Path("tests/fixtures/ivan_preview.html").read_text(encoding="utf-8")
+    expected = [(p.message_id, p.image_url) for p in parse_posts_from_html(html)]
+    monkeypatch.setattr("trader.web_preview_listener.BeautifulSoup", None)
+
+    posts = parse_posts_from_html(html)
+    assert [(p.message_id, p.image_url) for p in posts] == expected
+    assert "CYBER/USDT" in posts[-1].text
+    assert [p.message_id for p in parse_posts_from_html(html, min_message_id=12345)] == [12346]
+
+
+def test_regex_fallback_decodes_html_entities(monkeypatch) -> None:
+    html = (
+        '<div class="tgme_widget_message" data-post="ch/7">'
+        '<div class="tgme_widget_message_text">BTC &amp; ETH <b>&lt;long&gt;</b></div></div>'
+    )
+    monkeypatch.setattr("trader.web_preview_listener.BeautifulSoup", None)
+
+    assert parse_posts_from_html(html)[0].text == "BTC & ETH <long>"
+
+
+def test_failed_emit_refetches_page_instead_of_304() -> None:
+    html = Path("tests/fixtures/ivan_preview.html").read_text(encoding="utf-8")
+    listener = WebPreviewListener(ListenerConfig(mode="web_preview"), logger=logging.getLogger("test.web_preview"))
+    listener.config.polling_seconds = 0
+    listener._last_seen_message_id = 12344
+    validators = {"ETag": 'W/"abc"'}
+    session = _FakeSession([_FakeResponse(200, html, validators), _FakeResponse(200, html, validators)])
+    listener.session = session  # type: ignore[assignment]
+    emitted: list[int] = []
+
+    async def on_event(event) -> None:
+        if event.message_id == 12346 and len(session.sent_headers) == 1:
+            raise RuntimeError("handler failed")
+        emitted.append(event.message_id)
+        if event.message_id == 12346:
+            raise asyncio.CancelledError
+
+    try:
+        asyncio.run(listener.run(on_event))
+    except asyncio.CancelledError:
+        pass
+
+    assert session.sent_headers == [{}, {}]
+    assert emitted == [12345, 12346]
@@ -2,16 +2,29 @@ from __future__ import annotations
 
 import json
 import logging
-import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from trader.email_alert import SMTPAlertSender
 from trader.notifier import Notifier
+from trader.order_ids import new_trace_id
 from trader.store import SQLiteStore
 
 _LEVEL_ORDER = {"INFO": 20, "WARN": 30, "ERROR": 40, "CRITICAL": 50}
 
 
+class _AlertBatch:
+    __slots__ = ("pending", "open")
+
+    def __init__(self) -> None:
+        # (level, event_type, symbol) -> [msg, trace, payload, occurrences]
+        self.pending: dict[tuple[str, str, str], list[Any]] = {}
+        # Tasks spawned inside a batch inherit it; once flushed they deliver directly.
+        self.open = True
+
+
 class AlertManager:
     def __init__(
         self,
@@ -25,7 +38,43 @@ class AlertManager:
         self.store = store
         self.logger = logger
         self.min_level = min_level.upper()
+        self._min_level_order = _LEVEL_ORDER.get(self.min_level, 20)
         self.email_sender = email_sender
+        # The open batch of the current asyncio task/thread context, if any. A
+        # ContextVar (not instance state) so one component's batched tick does not
+        # hold back alerts that other tasks emit on the shared manager meanwhile.
+        self._batch: ContextVar[_AlertBatch | None] = ContextVar(f"alert_batch_{id(self)}", default=None)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer email/notifier delivery until the outermost batch exits.
+
+        Events are still logged and persisted immediately; repeated events with
+        the same (level, type, symbol) are delivered once with an occurrence count.
+        Only events emitted from the batching context (and threads/tasks it
+        spawns) are deferred, and CRITICAL events are always delivered at once.
+        """
+        outer = self._batch.get()
+        if outer is not None and outer.open:
+            yield
+            return
+        batch = _AlertBatch()
+        token = self._batch.set(batch)
+        try:
+            yield
+        finally:
+            self._batch.reset(token)
+            batch.open = False
+            self._flush(batch.pending)
+
+    def _flush(self, pending: dict[tuple[str, str, str], list[Any]]) -> None:
+        for (lvl, event_type, _symbol), (msg, trace, payload, occurrences) in pending.items():
+            if occurrences > 1:
+                payload = {**(payload or {}), "occurrences": occurrences}
+            try:
+                self._deliver(lvl, event_type, msg, trace, payload)
+            except Exception:  # noqa: BLE001
+                self.logger.exception("batched alert delivery failed event=%s trace=%s", event_type, trace)
 
     def emit(
         self,
@@ -36,7 +85,7 @@ class AlertManager:
         trace_id: str | None = None,
     ) -> str:
         lvl = level.upper()
-        trace = trace_id or uuid.uuid4().hex[:12]
+        trace = trace_id or new_trace_id()
         body = {
             "trace_id": trace,
             "level": lvl,
@@ -48,6 +97,27 @@ class AlertManager:
         self.logger.log(_LEVEL_ORDER.get(lvl, 20), json.dumps(body, ensure_ascii=False, default=str))
         self.store.record_event(event_type=event_type, level=lvl, msg=msg, payload=payload, trace_id=trace)
 
+        batch = self._batch.get()
+        if batch is not None and batch.open and lvl != "CRITICAL":
+            key = (lvl, event_type, str((payload or {}).get("symbol") or ""))
+            pending = batch.pending.get(key)
+            if pending is None:
+                batch.pending[key] = [msg, trace, payload, 1]
+            else:
+                pending[3] += 1
+            return trace
+
+        self._deliver(lvl, event_type, msg, trace, payload)
+        return trace
+
+    def _deliver(
+        self,
+        lvl: str,
+        event_type: str,
+        msg: str,
+        trace: str,
+        payload: dict[str, Any] | None,
+    ) -> None:
         if self.email_sender is not None:
             try:
                 self.email_sender.send(
@@ -60,14 +130,13 @@ class AlertManager:
             except Exception as exc:  # noqa: BLE001
                 self.logger.warning("email alert send failed event=%s err=%s", event_type, exc)
 
-        if _LEVEL_ORDER.get(lvl, 20) >= _LEVEL_ORDER.get(self.min_level, 20):
+        if _LEVEL_ORDER.get(lvl, 20) >= self._min_level_order:
             if lvl in {"ERROR", "CRITICAL"}:
                 self.notifier.error(f"[{lvl}] {msg} trace={trace}")
             elif lvl == "WARN":
                 self.notifier.warning(f"[{lvl}] {msg} trace={trace}")
             else:
                 self.notifier.info(f"[{lvl}] {msg} trace={trace}")
-        return trace
 
     def info(self, event_type: str, msg: str, payload: dict[str, Any] | None = None) -> str:
         return self.emit("INFO", event_type, msg, payload)
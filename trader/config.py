@@ -236,12 +236,15 @@ class RiskConfig(BaseModel):
         trigger_price_type: Literal["mark", "last"] = "mark"
         break_even_buffer_pct: float = Field(default=0.0005, ge=0, le=0.02)
         emergency_close_if_sl_place_fails: bool = True
+        max_concurrent_guard_closes: int = Field(default=4, ge=1, le=16)
 
     class CircuitBreakerConfig(BaseModel):
         consecutive_stop_losses: int = Field(default=3, ge=1, le=20)
         cooldown_seconds: int = Field(default=3600, ge=1, le=86400)
         api_error_burst: int = Field(default=10, ge=1, le=200)
         api_error_window_seconds: int = Field(default=120, ge=1, le=3600)
+        rest_failure_threshold: int = Field(default=5, ge=1, le=100)
+        rest_cooldown_seconds: int = Field(default=30, ge=1, le=3600)
 
     stoploss: StopLossConfig = Field(default_factory=StopLossConfig)
     circuit_breaker: CircuitBreakerConfig = Field(default_factory=CircuitBreakerConfig)
@@ -369,6 +372,7 @@ class MonitorPollIntervalsConfig(BaseModel):
     contracts_seconds: int = Field(default=3600, ge=30, le=86400)
     reconciler_seconds: int = Field(default=2, ge=1, le=300)
     risk_daemon_seconds: int = Field(default=2, ge=1, le=60)
+    risk_daemon_full_sweep_ticks: int = Field(default=10, ge=1, le=1000)
 
 
 class MonitorPriceFeedConfig(BaseModel):
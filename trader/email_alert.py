@@ -99,6 +99,7 @@ _PAYLOAD_LABELS = {
     "loss_pct": "亏损比例(%)",
     "threshold_pct": "告警阈值(%)",
     "cross_seq": "跨阈值序号",
+    "occurrences": "本轮出现次数",
 }
 
 
@@ -279,7 +280,7 @@ class SMTPAlertSender:
                 f"{event_type}|{payload.get('purpose') or ''}|"
                 f"{payload.get('reason') or ''}|{payload.get('window_seconds') or ''}"
             )
-        volatile_keys = {"ts", "time", "timestamp", "elapsed_ms", "count", "retry"}
+        volatile_keys = {"ts", "time", "timestamp", "elapsed_ms", "count", "retry", "occurrences"}
         stable = {
             key: value
             for key, value in payload.items()
@@ -313,6 +314,7 @@ class SMTPAlertSender:
             "elapsed_ms",
             "count",
             "retry",
+            "occurrences",
             "trace_id",
             "reason",
             "error",
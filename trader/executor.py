@@ -12,7 +12,7 @@ from trader.bitget_client import BitgetClient
 from trader.config import AppConfig
 from trader.models import EntrySignal, EntryType, ManageAction, OrderIntent, RiskDecision
 from trader.notifier import Notifier
-from trader.side_mapper import close_side_for_hold
+from trader.side_mapper import HoldSide, close_side_for_hold
 from trader.state import OrderState, PositionState, StateStore, utc_now
 from trader.stoploss_manager import StopLossManager
 from trader.store import SQLiteStore
@@ -1179,7 +1179,7 @@ class TradeExecutor:
         filled_total = 0.0
         for order in orders:
             filled_total += float(order.filled or 0.0)
-            if order.status.upper() in {"FILLED", "CANCELED", "FAILED", "REJECTED"}:
+            if order.is_terminal:
                 continue
             try:
                 if not self.config.dry_run:
@@ -1353,7 +1353,7 @@ class TradeExecutor:
                 continue
             if order.purpose.lower() != "tp":
                 continue
-            if order.status.upper() in {"FILLED", "CANCELED", "REJECTED", "FAILED"}:
+            if order.is_terminal:
                 continue
             try:
                 if not self.config.dry_run:
@@ -1897,7 +1897,7 @@ class TradeExecutor:
         if self.runtime_state is not None:
             pos = self.runtime_state.positions.get(symbol.upper())
             if pos is not None:
-                return "LONG" if pos.side.lower() == "long" else "SHORT"
+                return "LONG" if pos.side is HoldSide.LONG else "SHORT"
         try:
             position_payload = self.bitget.get_position(symbol)
             position = self._pick_position(position_payload)
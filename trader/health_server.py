@@ -72,8 +72,7 @@ class HealthServer:
 
     async def _write_metrics(self, writer: asyncio.StreamWriter) -> None:
         lines = []
-        snap = self.state.to_snapshot()
-        metrics = snap.get("metrics", {})
+        metrics = self.state.metrics_snapshot()
         for key in ["account_equity", "open_positions", "api_errors", "sl_missing_count", "circuit_breaker_state"]:
             value = float(metrics.get(key, 0.0))
             lines.append(f"trader_{key} {value}")
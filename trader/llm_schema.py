@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from functools import cache
 import re
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -183,10 +184,13 @@ class LLMParsedOutput(BaseModel):
         )
 
 
+# Schemas are static; callers must treat the returned dicts as read-only.
+@cache
 def get_llm_json_schema() -> dict:
     return LLMParsedOutput.model_json_schema()
 
 
+@cache
 def get_response_format(name: str = "signal_parser") -> dict:
     return {
         "type": "json_schema",
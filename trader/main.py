@@ -43,7 +43,7 @@ from trader.risk import RiskManager
 from trader.risk_daemon import RiskDaemon
 from trader.signal_validator import validate_parsed_message
 from trader.state import StateStore
-from trader.startup_probe import probe_plan_order_capability_on_startup
+from trader.startup_probe import probe_plan_order_capability_in_background
 from trader.stoploss_manager import StopLossManager
 from trader.store import SQLiteStore
 from trader.symbol_registry import SymbolRegistry
@@ -119,13 +119,6 @@ async def _run_async(config_path: Path) -> None:
     except Exception as exc:  # noqa: BLE001
         logger.warning("Initial SymbolRegistry refresh failed: %s", exc)
 
-    probe_plan_order_capability_on_startup(
-        config=config,
-        bitget=bitget,
-        alerts=alerts,
-        runtime_state=runtime_state,
-    )
-
     risk_manager = RiskManager(config, symbol_registry=symbol_registry)
     stoploss_manager = StopLossManager(
         config=config,
@@ -151,6 +144,15 @@ async def _run_async(config_path: Path) -> None:
 
     monitor_tasks: list[asyncio.Task] = []
     refresh_task = asyncio.create_task(_symbol_registry_refresh_loop(symbol_registry, logger, stop_event))
+    probe_task = asyncio.create_task(
+        probe_plan_order_capability_in_background(
+            config=config,
+            bitget=bitget,
+            alerts=alerts,
+            runtime_state=runtime_state,
+        ),
+        name="plan_order_probe",
+    )
 
     if config.monitor.enabled:
         poller = AccountPoller(config=config, bitget=bitget, state=runtime_state, store=store, alerts=alerts)
@@ -536,14 +538,19 @@ async def _run_async(config_path: Path) -> None:
         listener_task.cancel()
         stop_wait_task.cancel()
         refresh_task.cancel()
+        probe_task.cancel()
         for task in monitor_tasks:
             task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await listener_task
+        if isinstance(listener, TelegramPrivateListener):
+            await listener.close()
         with contextlib.suppress(asyncio.CancelledError):
             await stop_wait_task
         with contextlib.suppress(asyncio.CancelledError):
             await refresh_task
+        with contextlib.suppress(asyncio.CancelledError):
+            await probe_task
         for task in monitor_tasks:
             with contextlib.suppress(asyncio.CancelledError):
                 await task
@@ -750,7 +757,8 @@ async def _handle_private_event(
     )
     if thread_result.thread_id is None:
         # Fallback parse for non-thread messages to reduce missed root signals.
-        fallback_outcome = parser.parse(
+        fallback_outcome = await asyncio.to_thread(
+            parser.parse,
             text=text,
             timestamp=event.date,
             image_path=event.media_path,
@@ -761,7 +769,8 @@ async def _handle_private_event(
         )
         fallback_parsed = fallback_outcome.parsed
         if isinstance(fallback_parsed, NonSignal):
-            recovered = parser.recover_from_non_signal(
+            recovered = await asyncio.to_thread(
+                parser.recover_from_non_signal,
                 text=text,
                 timestamp=event.date,
                 image_path=event.media_path,
@@ -894,7 +903,8 @@ async def _handle_private_event(
         chat_id=event.chat_id,
         store=store,
     )
-    parse_outcome = parser.parse(
+    parse_outcome = await asyncio.to_thread(
+        parser.parse,
         text=text,
         timestamp=event.date,
         image_path=event.media_path,
@@ -904,7 +914,8 @@ async def _handle_private_event(
     )
     parsed = parse_outcome.parsed
     if isinstance(parsed, NonSignal):
-        recovered = parser.recover_from_non_signal(
+        recovered = await asyncio.to_thread(
+            parser.recover_from_non_signal,
             text=text,
             timestamp=event.date,
             image_path=event.media_path,
@@ -929,7 +940,8 @@ async def _handle_private_event(
             )
 
     if isinstance(parsed, EntrySignal) and parsed.entry_type == EntryType.MARKET and not _entry_has_anchor(parsed):
-        ai_anchor = parser.recover_from_non_signal(
+        ai_anchor = await asyncio.to_thread(
+            parser.recover_from_non_signal,
             text=text,
             timestamp=event.date,
             image_path=event.media_path,
@@ -143,7 +143,7 @@ class OrderAck:
     raw: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class TelegramEvent:
     chat_id: int
     message_id: int
@@ -3,20 +3,20 @@ from __future__ import annotations
 import asyncio
 import math
 import time
-from dataclasses import asdict
 
 from trader.alerts import AlertManager
 from trader.bitget_client import BitgetClient
 from trader.config import AppConfig
+from trader.order_ids import mint_client_oid
 from trader.side_mapper import close_side_for_hold, normalize_hold_side
-from trader.state import OrderState, PositionState, StateStore, utc_now
+from trader.state import TERMINAL_ORDER_STATUSES, OrderState, PositionState, StateStore, record_payload, utc_now
 from trader.stoploss_manager import StopLossManager
 from trader.store import SQLiteStore
 from trader.symbol_registry import SymbolRegistry
 from trader.tp_allocation import remaining_tp_weights
 
 
-_TERMINAL = {"FILLED", "CANCELED", "REJECTED", "FAILED"}
+_TERMINAL = TERMINAL_ORDER_STATUSES
 
 
 class OrderReconciler:
@@ -78,7 +78,7 @@ class OrderReconciler:
                 client_order_id=order.client_order_id,
                 action="DRY_RUN_FILLED",
                 reason=f"purpose={order.purpose}",
-                payload=asdict(order),
+                payload=record_payload(order),
                 trace_id=trace,
                 thread_id=order.thread_id,
                 purpose=order.purpose,
@@ -381,7 +381,7 @@ class OrderReconciler:
         reduce_only = self.config.bitget.position_mode == "one_way_mode"
         trade_side = "close" if self.config.bitget.position_mode == "hedge_mode" else None
         trigger = avg_entry
-        client_oid = f"be-{thread_id}-{int(utc_now().timestamp())}"
+        client_oid = mint_client_oid(f"be-{thread_id}")
 
         if self.config.dry_run:
             self.state.upsert_order(
@@ -626,7 +626,7 @@ class OrderReconciler:
                 continue
             if item.thread_id != thread_id:
                 continue
-            if item.status.upper() in {"CANCELED", "FAILED", "REJECTED", "FILLED"}:
+            if item.is_terminal:
                 continue
             is_close_order = bool(item.reduce_only) or (item.trade_side or "").lower() == "close"
             if not is_close_order:
@@ -710,7 +710,7 @@ class OrderReconciler:
                 )
                 continue
             order_size = float(normalized_size)
-            client_oid = f"tp-{thread_id or 0}-{idx}-{int(utc_now().timestamp())}"
+            client_oid = mint_client_oid(f"tp-{thread_id or 0}-{idx}")
             if self.config.dry_run:
                 self.state.upsert_order(
                     OrderState(
@@ -859,7 +859,7 @@ class OrderReconciler:
         thread_id: int | None,
         trace: str,
     ) -> None:
-        client_oid = f"be-local-{thread_id or 0}-{int(utc_now().timestamp())}"
+        client_oid = mint_client_oid(f"be-local-{thread_id or 0}")
         self.state.upsert_order(
             OrderState(
                 symbol=symbol,
@@ -901,7 +901,7 @@ class OrderReconciler:
         for order in list(self.state.orders_by_client_id.values()):
             if order.purpose.lower() != "be_reduce_local":
                 continue
-            if order.status.upper() in {"FILLED", "CANCELED", "FAILED", "REJECTED"}:
+            if order.is_terminal:
                 continue
             if order.trigger_price is None or not order.quantity or order.quantity <= 0:
                 continue
@@ -935,7 +935,7 @@ class OrderReconciler:
                     size=float(order.quantity),
                     order_type="market",
                     reduce_only=bool(order.reduce_only),
-                    client_oid=f"be-local-close-{int(utc_now().timestamp())}",
+                    client_oid=mint_client_oid("be-local-close"),
                 )
                 self.state.mark_order_status(
                     status="FILLED",
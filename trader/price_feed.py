@@ -132,7 +132,7 @@ class PriceFeed:
                         raw = await asyncio.wait_for(ws.recv(), timeout=self.config.monitor.price_feed.max_stale_seconds)
                         valid = self._process_ws_raw(raw)
                         if valid > 0:
-                            self.state.metrics["ws_fresh"] = 1.0
+                            self.state.mark_ws_fresh()
 
             except Exception as exc:  # noqa: BLE001
                 self.state.register_api_error()
@@ -3,14 +3,14 @@ from __future__ import annotations
 import asyncio
 import math
 import time
-from dataclasses import asdict
 
 from trader.alerts import AlertManager
 from trader.bitget_client import BitgetClient
 from trader.config import AppConfig
 from trader.kill_switch import KillSwitch, KillSwitchAction
-from trader.side_mapper import close_side_for_hold
-from trader.state import OrderState, PositionState, StateStore, utc_now
+from trader.order_ids import mint_client_oid
+from trader.side_mapper import HoldSide, close_side_for_hold
+from trader.state import OrderState, PositionState, StateStore, record_payload, utc_now
 from trader.stoploss_manager import StopLossManager
 from trader.store import SQLiteStore
 from trader.symbol_registry import SymbolRegistry
@@ -51,21 +51,34 @@ class RiskDaemon:
         self._tp_retry_after: dict[str, float] = {}
         self._no_sl_loss_alert_active: set[str] = set()
         self._no_sl_loss_alert_seq: dict[str, int] = {}
+        self._reduce_rest_failures = 0
+        self._tick_count = 0
+        self._liq_threshold = float(config.risk.max_liquidation_distance_pct)
+        self._reduce_rest_open_until = 0.0
 
     async def run(self, stop_event: asyncio.Event) -> None:
         interval = self.config.monitor.poll_intervals.risk_daemon_seconds
-        while not stop_event.is_set():
-            try:
-                await self.tick_once()
-            except Exception as exc:  # noqa: BLE001
-                self.state.register_api_error()
-                self.alerts.error("RISK_DAEMON_ERROR", f"risk daemon tick failed: {exc}")
-            try:
-                await asyncio.wait_for(stop_event.wait(), timeout=interval)
-            except TimeoutError:
-                pass
+        # One long-lived waiter reused across ticks: asyncio.wait times out without
+        # raising, unlike wait_for which wraps and cancels a fresh task every tick.
+        stop_task = asyncio.ensure_future(stop_event.wait())
+        try:
+            while not stop_event.is_set():
+                try:
+                    await self.tick_once()
+                except Exception as exc:  # noqa: BLE001
+                    self.state.register_api_error()
+                    self.alerts.error("RISK_DAEMON_ERROR", f"risk daemon tick failed: {exc}")
+                done, _ = await asyncio.wait({stop_task}, timeout=interval)
+                if stop_task in done:
+                    break
+        finally:
+            stop_task.cancel()
 
     async def tick_once(self) -> None:
+        with self.alerts.batch():
+            await self._tick_once_batched()
+
+    async def _tick_once_batched(self) -> None:
         self._apply_kill_switch()
         if self.config.risk.enabled:
             self._check_api_error_burst()
@@ -74,10 +87,22 @@ class RiskDaemon:
         # local_guard stop-loss processing is part of SL reliability guarantees.
         self.stoploss_manager.process_local_guards()
 
+        # Invariants only need re-checking for positions whose price/orders moved,
+        # plus those still flagged as missing SL (autofix escalation is time based).
+        # A full sweep every N ticks catches anything the dirty tracking missed.
+        dirty = self.state.take_dirty_positions()
+        full_sweep = self._tick_count % self.config.monitor.poll_intervals.risk_daemon_full_sweep_ticks == 0
+        self._tick_count += 1
+
         no_sl_alert_seen_keys: set[str] = set()
         for position in list(self.state.positions.values()):
             await self._ensure_tracked_position_protection(position)
-            await self._check_position_invariants(position)
+            if (
+                full_sweep
+                or position.symbol_key in dirty
+                or f"{position.symbol_key}::{position.side}" in self._sl_missing_active
+            ):
+                await self._check_position_invariants(position)
             alert_key = self._check_no_sl_loss_alert(position)
             if alert_key is not None:
                 no_sl_alert_seen_keys.add(alert_key)
@@ -155,8 +180,10 @@ class RiskDaemon:
         if account is None:
             return
 
-        if self.state.peak_equity and self.state.peak_equity > 0:
-            drawdown = (self.state.peak_equity - account.equity) / self.state.peak_equity
+        peak = self.state.peak_equity
+        peak_inv = self.state.peak_equity_inv
+        drawdown = (peak - account.equity) * peak_inv if peak and peak_inv > 0 else 0.0
+        if peak_inv > 0:
             if drawdown > self.config.risk.max_account_drawdown_pct:
                 if not self._drawdown_breaker_active:
                     self.alerts.error(
@@ -179,7 +206,7 @@ class RiskDaemon:
                 {
                     "purpose": "risk_control",
                     "reason": "drawdown_recovered",
-                    "drawdown": 0.0 if account is None or self.state.peak_equity in {None, 0} else (self.state.peak_equity - account.equity) / self.state.peak_equity,
+                    "drawdown": drawdown,
                     "max_account_drawdown_pct": self.config.risk.max_account_drawdown_pct,
                 },
             )
@@ -204,7 +231,7 @@ class RiskDaemon:
                     invariant_name="LIQ_DISTANCE_TOO_CLOSE",
                     symbol=position.symbol,
                     reason="report_only_no_auto_action",
-                    payload=asdict(position),
+                    payload=record_payload(position),
                     trace_id=trace,
                 )
                 return
@@ -213,16 +240,20 @@ class RiskDaemon:
                 await self._protective_close(position, reason="liquidation_distance_too_close")
             return
 
-        thread = self.store.get_latest_trade_thread_by_symbol(position.symbol, active_only=True)
-        if self._allow_no_stop_loss_for_thread(thread) and not self.state.has_valid_stop_loss(position.symbol, position.side):
-            return
+        # Covered positions are the steady state: check the in-memory SL once and
+        # only consult the thread's no-SL allowance (a DB read) when it is missing.
+        has_sl = self.state.has_valid_stop_loss(position.symbol, position.side)
+        if not has_sl:
+            thread = self.store.get_latest_trade_thread_by_symbol(position.symbol, active_only=True)
+            if self._allow_no_stop_loss_for_thread(thread):
+                return
 
         require_sl = self.config.risk.stoploss.must_exist or self.config.risk.hard_invariants.require_stoploss
         if not require_sl:
             return
 
-        sl_key = f"{position.symbol.upper()}::{position.side.lower()}"
-        if self.state.has_valid_stop_loss(position.symbol, position.side):
+        sl_key = f"{position.symbol_key}::{position.side}"
+        if has_sl:
             if sl_key in self._sl_missing_active:
                 self.alerts.info(
                     "SL_MISSING_RECOVERED",
@@ -238,7 +269,7 @@ class RiskDaemon:
             self._sl_missing_active.discard(sl_key)
             return
 
-        self.state.metrics["sl_missing_count"] = self.state.metrics.get("sl_missing_count", 0.0) + 1.0
+        self.state.register_sl_missing()
         trace: str | None = None
         if sl_key not in self._sl_missing_active:
             trace = self.alerts.warn(
@@ -256,7 +287,7 @@ class RiskDaemon:
                 invariant_name="SL_MUST_EXIST",
                 symbol=position.symbol,
                 reason="missing protective stop-loss",
-                payload=asdict(position),
+                payload=record_payload(position),
                 trace_id=trace,
             )
             self._sl_missing_active.add(sl_key)
@@ -345,6 +376,20 @@ class RiskDaemon:
             )
             return True
 
+        if time.monotonic() < self._reduce_rest_open_until:
+            # Recent reduce calls kept failing; go straight to protective close
+            # instead of adding another futile REST round trip.
+            self.store.record_reconciler_action(
+                symbol=position.symbol,
+                order_id=None,
+                client_order_id=None,
+                action="RISK_REDUCE_SKIPPED_CB_OPEN",
+                reason=reason,
+                payload={"qty": qty, "purpose": "reduce"},
+                trace_id=trace,
+            )
+            return False
+
         try:
             self.bitget.place_order(
                 symbol=position.symbol,
@@ -353,8 +398,9 @@ class RiskDaemon:
                 size=qty,
                 order_type="market",
                 reduce_only=self.config.bitget.position_mode == "one_way_mode",
-                client_oid=f"risk-reduce-{int(utc_now().timestamp() * 1000)}",
+                client_oid=mint_client_oid("risk-reduce"),
             )
+            self._reduce_rest_failures = 0
             self.store.record_reconciler_action(
                 symbol=position.symbol,
                 order_id=None,
@@ -367,6 +413,7 @@ class RiskDaemon:
             return True
         except Exception as exc:  # noqa: BLE001
             self.state.register_api_error()
+            self._record_reduce_rest_failure()
             self.store.record_reconciler_action(
                 symbol=position.symbol,
                 order_id=None,
@@ -378,6 +425,13 @@ class RiskDaemon:
             )
             return False
 
+    def _record_reduce_rest_failure(self) -> None:
+        cb = self.config.risk.circuit_breaker
+        self._reduce_rest_failures += 1
+        if self._reduce_rest_failures >= cb.rest_failure_threshold:
+            self._reduce_rest_open_until = time.monotonic() + cb.rest_cooldown_seconds
+            self._reduce_rest_failures = 0
+
     async def _protective_close(self, position: PositionState, reason: str) -> None:
         self.alerts.critical(
             "PANIC_CLOSE",
@@ -403,7 +457,7 @@ class RiskDaemon:
             invariant_name="PROTECTIVE_CLOSE",
             symbol=position.symbol,
             reason=reason,
-            payload=asdict(position),
+            payload=record_payload(position),
             trace_id=trace,
         )
 
@@ -452,17 +506,18 @@ class RiskDaemon:
             )
 
     def _is_liq_too_close(self, position: PositionState) -> bool:
-        if position.liq_price is None or position.mark_price is None or position.mark_price <= 0:
+        mark_price = position.mark_price
+        liq_price = position.liq_price
+        if liq_price is None or mark_price is None or mark_price <= 0:
             return False
-        distance = abs(position.liq_price - position.mark_price) / position.mark_price
-        return distance <= self.config.risk.max_liquidation_distance_pct
+        return abs(liq_price - mark_price) <= mark_price * self._liq_threshold
 
     async def _ensure_tracked_position_protection(self, position: PositionState) -> None:
         thread = self.store.get_latest_trade_thread_by_symbol(position.symbol, active_only=True)
         if thread is None:
             return
 
-        key = f"{position.symbol.upper()}::{position.side.lower()}"
+        key = f"{position.symbol_key}::{position.side}"
         tp_key = f"{key}::tp"
         now_ts = time.time()
         if now_ts < float(self._protection_retry_after.get(key, 0.0)):
@@ -500,14 +555,14 @@ class RiskDaemon:
             return
         thread_id = int(thread["thread_id"])
         tp_points = self._remaining_tp_points(thread_id)
-        tp_rearm_key = f"tp_rearm_required::{position.symbol.upper()}::{thread_id}"
+        tp_rearm_key = f"tp_rearm_required::{position.symbol_key}::{thread_id}"
         tp_rearm_required = self.store.get_system_flag(tp_rearm_key) is not None
         if not tp_points:
             if tp_rearm_required:
                 self.store.set_system_flag(tp_rearm_key, None)
             return
-        tp_guard_key = f"tp_submit_guard::{position.symbol.upper()}::{position.side.lower()}::{thread_id}"
-        tp_progress_key = f"tp_progress::{position.symbol.upper()}::{thread_id}"
+        tp_guard_key = f"tp_submit_guard::{position.symbol_key}::{position.side}::{thread_id}"
+        tp_progress_key = f"tp_progress::{position.symbol_key}::{thread_id}"
         last_tp_submit = self.store.get_system_flag(tp_guard_key)
         last_tp_progress = self.store.get_system_flag(tp_progress_key)
         last_tp_submit_ts = None
@@ -577,15 +632,15 @@ class RiskDaemon:
         if entry <= 0 or mark <= 0:
             return None
 
-        side = str(position.side or "").lower()
-        if side == "short":
+        side = position.side
+        if side is HoldSide.SHORT:
             loss_ratio = max((mark - entry) / entry, 0.0)
         else:
             loss_ratio = max((entry - mark) / entry, 0.0)
 
         threshold = float(self.config.risk.no_stop_loss_loss_alert_pct)
         thread_id = int(thread.get("thread_id")) if thread and thread.get("thread_id") is not None else 0
-        key = f"{position.symbol.upper()}::{side}::{thread_id}"
+        key = f"{position.symbol_key}::{side}::{thread_id}"
         if loss_ratio >= threshold:
             if key not in self._no_sl_loss_alert_active:
                 seq = int(self._no_sl_loss_alert_seq.get(key, 0)) + 1
@@ -616,9 +671,9 @@ class RiskDaemon:
         for order in self.state.all_orders():
             if order.thread_id != thread_id:
                 continue
-            if order.purpose.lower() != "tp":
+            if order.purpose_key != "tp":
                 continue
-            if order.status.upper() != "FILLED":
+            if order.status_key != "FILLED":
                 continue
             if order.trigger_price is None:
                 continue
@@ -626,22 +681,19 @@ class RiskDaemon:
         return self.store.get_remaining_tp_points(thread_id)
 
     def _has_active_tp(self, position: PositionState, thread_id: int, *, tp_points: list[float] | None = None) -> bool:
-        symbol = position.symbol
         expected_close_side = close_side_for_hold(position.side, self.config.bitget.position_mode)
         entry_price = float(position.entry_price) if position.entry_price not in {None, 0} else None
         remaining_tp_points = [float(v) for v in (tp_points if tp_points is not None else self._remaining_tp_points(thread_id))]
-        for order in self.state.all_orders():
-            if order.symbol.upper() != symbol.upper():
-                continue
-            if order.status.upper() in {"CANCELED", "FAILED", "REJECTED", "FILLED"}:
+        for order in self.state.orders_for_symbol(position.symbol):
+            if order.is_terminal:
                 continue
-            is_close_order = bool(order.reduce_only) or (order.trade_side or "").lower() == "close"
+            is_close_order = bool(order.reduce_only) or order.trade_side_key == "close"
             if not is_close_order:
                 continue
-            if order.side.lower() != expected_close_side:
+            if order.side_key != expected_close_side:
                 continue
 
-            if order.thread_id == thread_id and order.purpose.lower() == "tp":
+            if order.thread_id == thread_id and order.purpose_key == "tp":
                 if order.trigger_price is None:
                     return True
                 trigger_price = float(order.trigger_price)
@@ -651,7 +703,7 @@ class RiskDaemon:
                     return True
                 continue
 
-            purpose = (order.purpose or "").lower()
+            purpose = order.purpose_key
             client_oid = (order.client_order_id or "").lower()
             if purpose == "sl" or client_oid.startswith("sl-"):
                 continue
@@ -673,9 +725,9 @@ class RiskDaemon:
                 return True
             if remaining_tp_points:
                 continue
-            if position.side.lower() == "long" and trigger_price > entry_price:
+            if position.side is HoldSide.LONG and trigger_price > entry_price:
                 return True
-            if position.side.lower() == "short" and trigger_price < entry_price:
+            if position.side is HoldSide.SHORT and trigger_price < entry_price:
                 return True
         return False
 
@@ -713,7 +765,7 @@ class RiskDaemon:
                 last_reason = reject_reason or "invalid_tp_size"
                 continue
             order_size = float(normalized_size)
-            client_oid = f"tp-{thread_id}-{idx}-{int(utc_now().timestamp())}"
+            client_oid = mint_client_oid(f"tp-{thread_id}-{idx}")
             if self.config.dry_run:
                 self.state.upsert_order(
                     OrderState(
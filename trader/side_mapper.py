@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+from enum import StrEnum
 
-def normalize_hold_side(side: str | None) -> str:
+
+class HoldSide(StrEnum):
+    LONG = "long"
+    SHORT = "short"
+
+
+def normalize_hold_side(side: str | None) -> HoldSide:
+    if isinstance(side, HoldSide):
+        return side
     value = str(side or "").strip().lower()
     if value in {"long", "buy"}:
-        return "long"
+        return HoldSide.LONG
     if value in {"short", "sell"}:
-        return "short"
-    return "long"
+        return HoldSide.SHORT
+    return HoldSide.LONG
 
 
 def open_side_for_hold(hold_side: str | None) -> str:
-    return "buy" if normalize_hold_side(hold_side) == "long" else "sell"
+    return "buy" if normalize_hold_side(hold_side) is HoldSide.LONG else "sell"
 
 
 def close_side_for_hold(hold_side: str | None, position_mode: str | None) -> str:
@@ -20,5 +29,5 @@ def close_side_for_hold(hold_side: str | None, position_mode: str | None) -> str
         # In hedge mode, side encodes position direction and tradeSide encodes open/close.
         return open_side_for_hold(normalized)
     # In one-way mode, side encodes order direction.
-    return "sell" if normalized == "long" else "buy"
+    return "sell" if normalized is HoldSide.LONG else "buy"
 
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 from trader.alerts import AlertManager
 from trader.bitget_client import BitgetClient
 from trader.config import AppConfig
@@ -17,6 +20,37 @@ def probe_plan_order_capability_on_startup(
         return
 
     state = bitget.probe_plan_orders_capability(force=True)
+    _apply_probe_result(state, config=config, alerts=alerts)
+
+
+async def probe_plan_order_capability_in_background(
+    *,
+    config: AppConfig,
+    bitget: BitgetClient,
+    alerts: AlertManager,
+    runtime_state: StateStore,
+) -> None:
+    """Run the startup probe without blocking boot on Bitget latency.
+
+    Only the network call runs in a worker thread; alerts and the config
+    fallback are applied back on the event loop.
+    """
+    if not config.bitget.plan_orders_probe_on_startup:
+        return
+    try:
+        state = await asyncio.to_thread(bitget.probe_plan_orders_capability, force=True)
+    except Exception as exc:  # noqa: BLE001
+        runtime_state.register_api_error()
+        alerts.warn(
+            "PLAN_ORDER_CAPABILITY_PROBE",
+            "plan order capability probe raised",
+            {"supported": None, "reason": str(exc), "sl_order_type": config.risk.stoploss.sl_order_type},
+        )
+        return
+    _apply_probe_result(state, config=config, alerts=alerts)
+
+
+def _apply_probe_result(state: dict[str, Any], *, config: AppConfig, alerts: AlertManager) -> None:
     supported = state.get("supported")
     reason = str(state.get("reason") or "unknown")
     if state.get("expires_at") and state.get("ts"):
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
 import threading
-from dataclasses import asdict, dataclass, field
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timezone
 from typing import Any
 
-from trader.side_mapper import close_side_for_hold
+from trader.side_mapper import HoldSide, close_side_for_hold, normalize_hold_side
 
+try:
+    from fastrlock.rlock import FastRLock as _RLock
+except ImportError:  # optional speedup; same reentrant semantics
+    _RLock = threading.RLock
 
-@dataclass
+TERMINAL_ORDER_STATUSES = frozenset({"FILLED", "CANCELED", "REJECTED", "FAILED"})
+_ENTRY_PURPOSES = frozenset({"entry", "entry_partial"})
+# Normalized copies of symbol/status/side/purpose kept on the dataclasses so
+# filter loops compare plain strings; not part of the persisted snapshot.
+_CACHED_KEY_FIELDS = frozenset(
+    {"symbol_key", "status_key", "side_key", "purpose_key", "trade_side_key", "is_terminal"}
+)
+
+
+@dataclass(frozen=True, slots=True)
 class AccountState:
     equity: float
     available: float
@@ -16,10 +32,10 @@ class AccountState:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionState:
     symbol: str
-    side: str
+    side: HoldSide
     size: float
     entry_price: float | None
     mark_price: float | None
@@ -30,9 +46,15 @@ class PositionState:
     timestamp: datetime
     unknown_origin: bool = False
     opened_at: datetime | None = None
+    symbol_key: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Normalize once at ingest so risk paths can compare by identity.
+        self.side = normalize_hold_side(self.side)
+        self.symbol_key = norm_symbol(self.symbol)
 
-@dataclass
+
+@dataclass(slots=True)
 class OrderState:
     symbol: str
     side: str
@@ -51,20 +73,40 @@ class OrderState:
     parent_client_order_id: str | None = None
     thread_id: int | None = None
     entry_index: int | None = None
-
-
-@dataclass
+    symbol_key: str = field(init=False, repr=False, compare=False)
+    status_key: str = field(init=False, repr=False, compare=False)
+    side_key: str = field(init=False, repr=False, compare=False)
+    purpose_key: str = field(init=False, repr=False, compare=False)
+    trade_side_key: str = field(init=False, repr=False, compare=False)
+    is_terminal: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.refresh_keys()
+
+    def refresh_keys(self) -> None:
+        self.symbol_key = norm_symbol(self.symbol)
+        self.status_key = self.status.upper()
+        self.is_terminal = self.status_key in TERMINAL_ORDER_STATUSES
+        self.side_key = self.side.lower()
+        self.purpose_key = (self.purpose or "").lower()
+        self.trade_side_key = (self.trade_side or "").lower()
+
+
+@dataclass(slots=True)
 class LocalGuardStop:
     symbol: str
-    side: str
+    side: HoldSide
     trigger_price: float
     size: float
     reason: str
     created_at: datetime
     active: bool = True
 
+    def __post_init__(self) -> None:
+        self.side = normalize_hold_side(self.side)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PriceSnapshot:
     symbol: str
     timestamp: datetime
@@ -81,12 +123,30 @@ class StateStore:
     """
 
     def __init__(self) -> None:
-        self._lock = threading.RLock()
+        # Lock order: _lock (account/positions/orders/guards/modes) before
+        # _prices_lock (price snapshots and feed freshness) before
+        # _metrics_lock (metrics, API-error window, WS counters). Tick and
+        # counter paths take only the narrower locks they need.
+        self._lock = _RLock()
+        self._prices_lock = _RLock()
+        self._metrics_lock = _RLock()
         self.account: AccountState | None = None
         self.positions: dict[str, PositionState] = {}
+        # Symbols whose position, price or protective orders changed since the
+        # risk daemon last drained them via take_dirty_positions().
+        self._positions_dirty: set[str] = set()
         self.orders_by_client_id: dict[str, OrderState] = {}
         self.orders_by_exchange_id: dict[str, OrderState] = {}
-        self.local_guard_stops: dict[str, LocalGuardStop] = {}
+        # Upper-cased symbol -> orders still referenced by either id index,
+        # keyed by object identity so per-symbol scans skip unrelated orders.
+        self.orders_by_symbol: dict[str, dict[int, OrderState]] = {}
+        self.local_guard_stops: dict[tuple[str, HoldSide], LocalGuardStop] = {}
+        # Polled views, rebuilt lazily; cleared by the order/guard setters.
+        self._pending_cache: tuple[OrderState, ...] | None = None
+        self._entry_symbols_cache: frozenset[str] | None = None
+        self._active_guards_cache: tuple[LocalGuardStop, ...] | None = None
+        # Plain int so idle pollers can skip guard processing without the lock.
+        self.active_local_guard_count: int = 0
         self.prices: dict[str, PriceSnapshot] = {}
         self.price_feed_mode: str = "rest"
         self.price_feed_degraded: bool = False
@@ -103,18 +163,23 @@ class StateStore:
         self.ws_parse_errors_total: int = 0
         self.last_reconciler_ok_at: datetime | None = None
         self.peak_equity: float | None = None
-        self.api_error_timestamps: list[datetime] = []
-        self.metrics: dict[str, float] = {
-            "api_errors": 0.0,
-            "sl_missing_count": 0.0,
-            "circuit_breaker_state": 0.0,
-            "open_positions": 0.0,
-            "account_equity": 0.0,
-            "ws_parse_errors": 0.0,
-            "ws_messages": 0.0,
-            "ws_fresh": 0.0,
-            "sl_coverage_ratio": 1.0,
-        }
+        self.peak_equity_inv: float = 0.0
+        # Epoch seconds in arrival order; expired entries are popped from the left.
+        self.api_error_timestamps: deque[float] = deque()
+        self.metrics: defaultdict[str, float] = defaultdict(
+            float,
+            {
+                "api_errors": 0.0,
+                "sl_missing_count": 0.0,
+                "circuit_breaker_state": 0.0,
+                "open_positions": 0.0,
+                "account_equity": 0.0,
+                "ws_parse_errors": 0.0,
+                "ws_messages": 0.0,
+                "ws_fresh": 0.0,
+                "sl_coverage_ratio": 1.0,
+            },
+        )
 
     def set_account(self, equity: float, available: float, margin_used: float, timestamp: datetime | None = None) -> None:
         with self._lock:
@@ -128,30 +193,48 @@ class StateStore:
             self.last_account_ok_at = now
             if self.peak_equity is None or equity > self.peak_equity:
                 self.peak_equity = float(equity)
-            self.metrics["account_equity"] = float(equity)
+                self.peak_equity_inv = 1.0 / self.peak_equity if self.peak_equity > 0 else 0.0
+            with self._metrics_lock:
+                self.metrics["account_equity"] = float(equity)
 
     def set_positions(self, positions: list[PositionState], timestamp: datetime | None = None) -> None:
         with self._lock:
             now = timestamp or utc_now()
-            current = {p.symbol.upper(): p for p in positions}
-            for p in current.values():
+            current = {p.symbol_key: p for p in positions}
+            for key, p in current.items():
+                old = self.positions.get(key)
                 if p.opened_at is None:
-                    old = self.positions.get(p.symbol.upper())
                     p.opened_at = old.opened_at if old and old.opened_at else now
                 p.timestamp = now
+                if old is None or _position_fingerprint(old) != _position_fingerprint(p):
+                    self._positions_dirty.add(key)
             self.positions = current
             self.last_positions_ok_at = now
-            self.metrics["open_positions"] = float(len(self.positions))
+            with self._metrics_lock:
+                self.metrics["open_positions"] = float(len(self.positions))
 
     def upsert_order(self, order: OrderState) -> None:
         with self._lock:
             now = utc_now()
             order.timestamp = now
+            order.refresh_keys()
+            displaced: list[OrderState] = []
             if order.client_order_id:
+                prev = self.orders_by_client_id.get(order.client_order_id)
+                if prev is not None and prev is not order:
+                    displaced.append(prev)
                 self.orders_by_client_id[order.client_order_id] = order
             if order.order_id:
+                prev = self.orders_by_exchange_id.get(order.order_id)
+                if prev is not None and prev is not order:
+                    displaced.append(prev)
                 self.orders_by_exchange_id[order.order_id] = order
+            self.orders_by_symbol.setdefault(order.symbol_key, {})[id(order)] = order
+            self._invalidate_order_views_locked()
+            for prev in displaced:
+                self._unindex_if_unreferenced_locked(prev)
             self.last_orders_ok_at = now
+            self._positions_dirty.add(order.symbol_key)
 
     def find_order(self, client_order_id: str | None = None, order_id: str | None = None) -> OrderState | None:
         with self._lock:
@@ -163,39 +246,38 @@ class StateStore:
 
     def pending_orders(self) -> list[OrderState]:
         with self._lock:
-            return [
-                order
-                for order in self.orders_by_client_id.values()
-                if order.status.upper() not in {"FILLED", "CANCELED", "REJECTED", "FAILED"}
-            ]
+            if self._pending_cache is None:
+                self._pending_cache = tuple(order for order in self.orders_by_client_id.values() if not order.is_terminal)
+            return list(self._pending_cache)
 
     def all_orders(self) -> list[OrderState]:
         with self._lock:
             return self._all_orders_locked()
 
+    def orders_for_symbol(self, symbol: str) -> list[OrderState]:
+        with self._lock:
+            return self._orders_for_symbol_locked(norm_symbol(symbol))
+
     def clear_orders_for_symbol(self, symbol: str) -> None:
         with self._lock:
-            key = symbol.upper()
-            keep_client: dict[str, OrderState] = {}
-            keep_exchange: dict[str, OrderState] = {}
-            for client_id, order in self.orders_by_client_id.items():
-                if order.symbol.upper() == key:
-                    continue
-                keep_client[client_id] = order
-            for exchange_id, order in self.orders_by_exchange_id.items():
-                if order.symbol.upper() == key:
-                    continue
-                keep_exchange[exchange_id] = order
-            self.orders_by_client_id = keep_client
-            self.orders_by_exchange_id = keep_exchange
+            key = norm_symbol(symbol)
+            for order in self.orders_by_symbol.pop(key, {}).values():
+                if order.client_order_id and self.orders_by_client_id.get(order.client_order_id) is order:
+                    del self.orders_by_client_id[order.client_order_id]
+                if order.order_id and self.orders_by_exchange_id.get(order.order_id) is order:
+                    del self.orders_by_exchange_id[order.order_id]
+            self._invalidate_order_views_locked()
+            self._positions_dirty.add(key)
 
     def known_entry_symbols(self) -> set[str]:
         with self._lock:
-            return {
-                order.symbol.upper()
-                for order in self._all_orders_locked()
-                if order.purpose.lower() in {"entry", "entry_partial"} and order.status.upper() != "REJECTED"
-            }
+            if self._entry_symbols_cache is None:
+                self._entry_symbols_cache = frozenset(
+                    order.symbol_key
+                    for order in self._all_orders_locked()
+                    if order.purpose_key in _ENTRY_PURPOSES and order.status_key != "REJECTED"
+                )
+            return set(self._entry_symbols_cache)
 
     def mark_order_status(
         self,
@@ -211,6 +293,9 @@ class StateStore:
             if order is None:
                 return
             order.status = status
+            order.status_key = status.upper()
+            order.is_terminal = order.status_key in TERMINAL_ORDER_STATUSES
+            self._invalidate_order_views_locked()
             if filled is not None:
                 order.filled = float(filled)
             if avg_price is not None:
@@ -220,153 +305,108 @@ class StateStore:
                 self.orders_by_exchange_id[order.order_id] = order
             if order.client_order_id:
                 self.orders_by_client_id[order.client_order_id] = order
+            self._positions_dirty.add(order.symbol_key)
 
     def has_valid_stop_loss(self, symbol: str, position_side: str) -> bool:
         with self._lock:
-            position = self.positions.get(symbol.upper())
-            entry_price = None
-            if position is not None and position.side.lower() == position_side.lower():
-                entry_price = position.entry_price
-            guard = self.local_guard_stops.get(_guard_key(symbol, position_side))
-            if guard and guard.active:
-                return True
-            for order in self._all_orders_locked():
-                if order.symbol.upper() != symbol.upper():
-                    continue
-                purpose = order.purpose.lower()
-                if purpose != "sl":
-                    if purpose != "close":
-                        continue
-                    if order.trigger_price is None or entry_price is None:
-                        continue
-                    if position_side.lower() == "long" and float(order.trigger_price) > float(entry_price):
-                        continue
-                    if position_side.lower() == "short" and float(order.trigger_price) < float(entry_price):
-                        continue
-                if order.status.upper() in {"CANCELED", "FAILED", "REJECTED", "FILLED"}:
-                    continue
-                trade_side = (order.trade_side or "").lower()
-                if trade_side == "close":
-                    expected_close_side = close_side_for_hold(position_side, "hedge_mode")
-                elif order.reduce_only:
-                    expected_close_side = close_side_for_hold(position_side, "one_way_mode")
-                else:
-                    continue
-                if order.side.lower() != expected_close_side:
-                    continue
-                return True
-        return False
+            return self._has_valid_stop_loss_locked(symbol, position_side)
 
     def get_stop_loss_order(self, symbol: str, position_side: str) -> OrderState | None:
         with self._lock:
-            position = self.positions.get(symbol.upper())
-            entry_price = None
-            if position is not None and position.side.lower() == position_side.lower():
-                entry_price = position.entry_price
-            for order in self._all_orders_locked():
-                if order.symbol.upper() != symbol.upper():
-                    continue
-                purpose = order.purpose.lower()
-                if purpose != "sl":
-                    if purpose != "close":
-                        continue
-                    if order.trigger_price is None or entry_price is None:
-                        continue
-                    if position_side.lower() == "long" and float(order.trigger_price) > float(entry_price):
-                        continue
-                    if position_side.lower() == "short" and float(order.trigger_price) < float(entry_price):
-                        continue
-                if order.status.upper() in {"CANCELED", "FAILED", "REJECTED", "FILLED"}:
-                    continue
-                trade_side = (order.trade_side or "").lower()
-                if trade_side == "close":
-                    expected_close_side = close_side_for_hold(position_side, "hedge_mode")
-                elif order.reduce_only:
-                    expected_close_side = close_side_for_hold(position_side, "one_way_mode")
-                else:
-                    continue
-                if order.side.lower() != expected_close_side:
-                    continue
-                return order
-        return None
+            return self._find_stop_loss_order_locked(symbol, position_side)
 
     def register_api_error(self, timestamp: datetime | None = None) -> None:
-        with self._lock:
-            now = timestamp or utc_now()
-            self.api_error_timestamps.append(now)
-            self.metrics["api_errors"] = self.metrics.get("api_errors", 0.0) + 1.0
+        # Epoch floats straight from the clock; only caller-supplied datetimes
+        # pay for the tz-aware .timestamp() conversion.
+        epoch = timestamp.timestamp() if timestamp is not None else time.time()
+        with self._metrics_lock:
+            self.api_error_timestamps.append(epoch)
+            self.metrics["api_errors"] += 1.0
+
+    def register_sl_missing(self) -> None:
+        with self._metrics_lock:
+            self.metrics["sl_missing_count"] += 1.0
+
+    def mark_ws_fresh(self) -> None:
+        with self._metrics_lock:
+            self.metrics["ws_fresh"] = 1.0
 
     def api_errors_in_window(self, window_seconds: int, now: datetime | None = None) -> int:
-        with self._lock:
-            ref = now or utc_now()
-            cutoff = ref.timestamp() - window_seconds
-            kept = [t for t in self.api_error_timestamps if t.timestamp() >= cutoff]
-            self.api_error_timestamps = kept
-            return len(kept)
+        cutoff = (now.timestamp() if now is not None else time.time()) - window_seconds
+        with self._metrics_lock:
+            timestamps = self.api_error_timestamps
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+            return len(timestamps)
 
     def enable_safe_mode(self, reason: str) -> None:
         with self._lock:
             self.safe_mode = True
             self.block_new_entries_reason = reason
-            self.metrics["circuit_breaker_state"] = 1.0
+            with self._metrics_lock:
+                self.metrics["circuit_breaker_state"] = 1.0
 
     def disable_safe_mode(self) -> None:
         with self._lock:
             self.safe_mode = False
             self.block_new_entries_reason = None
             if not self.panic_mode:
-                self.metrics["circuit_breaker_state"] = 0.0
+                with self._metrics_lock:
+                    self.metrics["circuit_breaker_state"] = 0.0
 
     def enable_panic_mode(self, reason: str) -> None:
         with self._lock:
             self.panic_mode = True
             self.safe_mode = True
             self.block_new_entries_reason = reason
-            self.metrics["circuit_breaker_state"] = 2.0
+            with self._metrics_lock:
+                self.metrics["circuit_breaker_state"] = 2.0
 
     def set_price_fresh(self, timestamp: datetime | None = None) -> None:
-        with self._lock:
+        with self._prices_lock:
             self.last_price_ok_at = timestamp or utc_now()
 
     def register_ws_message(self, timestamp: datetime | None = None) -> None:
-        with self._lock:
+        with self._metrics_lock:
             now = timestamp or utc_now()
             self.last_ws_message_at = now
             self.ws_messages_total += 1
             self.metrics["ws_messages"] = float(self.ws_messages_total)
 
     def register_ws_parse_error(self, reason: str, timestamp: datetime | None = None) -> None:
-        with self._lock:
-            _ = reason
-            _ = timestamp or utc_now()
+        with self._metrics_lock:
+            _ = reason, timestamp
             self.ws_parse_errors_total += 1
             self.metrics["ws_parse_errors"] = float(self.ws_parse_errors_total)
 
     def set_symbol_price_fresh(self, symbol: str, timestamp: datetime | None = None) -> None:
-        with self._lock:
-            self.last_ws_snapshot_at_by_symbol[symbol.upper()] = timestamp or utc_now()
+        with self._prices_lock:
+            self.last_ws_snapshot_at_by_symbol[norm_symbol(symbol)] = timestamp or utc_now()
 
     def set_mark_price(self, symbol: str, mark_price: float, timestamp: datetime | None = None) -> None:
+        # Resolve the clock and key before taking the lock; one now per update.
+        now = timestamp or utc_now()
+        key = norm_symbol(symbol)
+        mark = float(mark_price)
         with self._lock:
-            key = symbol.upper()
             pos = self.positions.get(key)
             if pos is not None:
-                pos.mark_price = float(mark_price)
-                pos.timestamp = timestamp or utc_now()
+                pos.mark_price = mark
+                pos.timestamp = now
+                self._positions_dirty.add(key)
+        with self._prices_lock:
             snap = self.prices.get(key)
             if snap is None:
-                snap = PriceSnapshot(
+                self.prices[key] = PriceSnapshot(
                     symbol=key,
-                    timestamp=timestamp or utc_now(),
-                    mark=float(mark_price),
+                    timestamp=now,
+                    mark=mark,
                     last=None,
                     bid=None,
                     ask=None,
                 )
             else:
-                snap.mark = float(mark_price)
-                snap.timestamp = timestamp or utc_now()
-            self.prices[key] = snap
+                self.prices[key] = replace(snap, mark=mark, timestamp=now)
 
     def set_price_snapshot(
         self,
@@ -377,35 +417,58 @@ class StateStore:
         ask: float | None,
         timestamp: datetime | None = None,
     ) -> None:
-        with self._lock:
-            key = symbol.upper()
+        now = timestamp or utc_now()
+        key = norm_symbol(symbol)
+        with self._prices_lock:
             self.prices[key] = PriceSnapshot(
                 symbol=key,
-                timestamp=timestamp or utc_now(),
+                timestamp=now,
                 mark=mark,
                 last=last,
                 bid=bid,
                 ask=ask,
             )
-            if mark is not None:
+        if mark is not None:
+            with self._lock:
                 pos = self.positions.get(key)
                 if pos is not None:
                     pos.mark_price = mark
-                    pos.timestamp = timestamp or utc_now()
+                    pos.timestamp = now
+                    self._positions_dirty.add(key)
 
     def get_price(self, symbol: str) -> PriceSnapshot | None:
-        with self._lock:
-            return self.prices.get(symbol.upper())
+        # Snapshots are frozen and swapped whole, so a bare dict read is consistent.
+        return self.prices.get(norm_symbol(symbol))
+
+    def get_prices(self, symbols: Iterable[str]) -> dict[str, PriceSnapshot]:
+        # One lock round-trip for a batch of symbols; keys are the caller's spelling.
+        with self._prices_lock:
+            prices = self.prices
+            result: dict[str, PriceSnapshot] = {}
+            for symbol in symbols:
+                snap = prices.get(norm_symbol(symbol))
+                if snap is not None:
+                    result[symbol] = snap
+            return result
 
     def set_price_feed_mode(self, mode: str, degraded: bool) -> None:
-        with self._lock:
+        with self._prices_lock:
             self.price_feed_mode = mode
             self.price_feed_degraded = degraded
-            self.metrics["ws_fresh"] = 0.0 if degraded or mode != "ws" else 1.0
+            with self._metrics_lock:
+                self.metrics["ws_fresh"] = 0.0 if degraded or mode != "ws" else 1.0
 
     def register_local_guard_stop(self, guard: LocalGuardStop) -> None:
         with self._lock:
-            self.local_guard_stops[_guard_key(guard.symbol, guard.side)] = guard
+            key = _guard_key(guard.symbol, guard.side)
+            old = self.local_guard_stops.get(key)
+            if old is not None and old.active:
+                self.active_local_guard_count -= 1
+            self.local_guard_stops[key] = guard
+            if guard.active:
+                self.active_local_guard_count += 1
+            self._active_guards_cache = None
+            self._positions_dirty.add(norm_symbol(guard.symbol))
 
     def get_local_guard_stop(self, symbol: str, side: str) -> LocalGuardStop | None:
         with self._lock:
@@ -415,38 +478,55 @@ class StateStore:
         with self._lock:
             guard = self.local_guard_stops.get(_guard_key(symbol, side))
             if guard is not None:
+                if guard.active:
+                    self.active_local_guard_count -= 1
                 guard.active = False
+                self._active_guards_cache = None
+                self._positions_dirty.add(norm_symbol(symbol))
 
     def active_local_guards(self) -> list[LocalGuardStop]:
         with self._lock:
-            return [g for g in self.local_guard_stops.values() if g.active]
+            if self._active_guards_cache is None:
+                self._active_guards_cache = tuple(g for g in self.local_guard_stops.values() if g.active)
+            return list(self._active_guards_cache)
+
+    def take_dirty_positions(self) -> set[str]:
+        with self._lock:
+            dirty = self._positions_dirty
+            self._positions_dirty = set()
+            return dirty
 
     def recompute_sl_coverage_metric(self) -> None:
         with self._lock:
-            if not self.positions:
-                self.metrics["sl_coverage_ratio"] = 1.0
-                return
-            covered = 0
-            for p in self.positions.values():
-                if self.has_valid_stop_loss(p.symbol, p.side):
-                    covered += 1
-            self.metrics["sl_coverage_ratio"] = covered / max(len(self.positions), 1)
+            # Each lookup walks only that symbol's orders_by_symbol bucket, so the
+            # whole pass is O(orders + positions) rather than O(orders * positions).
+            covered = sum(1 for p in self.positions.values() if self._has_valid_stop_loss_locked(p.symbol, p.side))
+            ratio = covered / len(self.positions) if self.positions else 1.0
+            with self._metrics_lock:
+                self.metrics["sl_coverage_ratio"] = ratio
 
     def set_reconciler_fresh(self, timestamp: datetime | None = None) -> None:
         with self._lock:
             self.last_reconciler_ok_at = timestamp or utc_now()
 
+    def metrics_snapshot(self) -> dict[str, float]:
+        with self._metrics_lock:
+            return dict(self.metrics)
+
     def to_snapshot(self) -> dict[str, Any]:
-        with self._lock:
-            return {
-                "account": asdict(self.account) if self.account else None,
-                "positions": {k: asdict(v) for k, v in self.positions.items()},
-                "orders": {k: asdict(v) for k, v in self.orders_by_client_id.items()},
-                "local_guards": {k: asdict(v) for k, v in self.local_guard_stops.items()},
-                "prices": {k: asdict(v) for k, v in self.prices.items()},
-                "last_ws_snapshot_at_by_symbol": {
-                    k: v.isoformat() for k, v in self.last_ws_snapshot_at_by_symbol.items()
-                },
+        # Position/order/guard records are mutated in place, so their fields are
+        # copied under the locks; only isoformat strings are built afterwards.
+        with self._lock, self._prices_lock, self._metrics_lock:
+            account = self.account
+            positions = {k: _record_dict(v, _POSITION_FIELDS) for k, v in self.positions.items()}
+            orders = {k: _record_dict(v, _ORDER_FIELDS) for k, v in self.orders_by_client_id.items()}
+            guards = {
+                f"{symbol}::{side}": _record_dict(v, _GUARD_FIELDS)
+                for (symbol, side), v in self.local_guard_stops.items()
+            }
+            prices = list(self.prices.items())
+            ws_snapshot_at = list(self.last_ws_snapshot_at_by_symbol.items())
+            snapshot: dict[str, Any] = {
                 "ws_messages_total": self.ws_messages_total,
                 "ws_parse_errors_total": self.ws_parse_errors_total,
                 "price_feed_mode": self.price_feed_mode,
@@ -455,13 +535,85 @@ class StateStore:
                 "panic_mode": self.panic_mode,
                 "block_new_entries_reason": self.block_new_entries_reason,
                 "metrics": dict(self.metrics),
-                "last_account_ok_at": self.last_account_ok_at.isoformat() if self.last_account_ok_at else None,
-                "last_positions_ok_at": self.last_positions_ok_at.isoformat() if self.last_positions_ok_at else None,
-                "last_orders_ok_at": self.last_orders_ok_at.isoformat() if self.last_orders_ok_at else None,
-                "last_price_ok_at": self.last_price_ok_at.isoformat() if self.last_price_ok_at else None,
-                "last_ws_message_at": self.last_ws_message_at.isoformat() if self.last_ws_message_at else None,
-                "last_reconciler_ok_at": self.last_reconciler_ok_at.isoformat() if self.last_reconciler_ok_at else None,
+                "last_account_ok_at": self.last_account_ok_at,
+                "last_positions_ok_at": self.last_positions_ok_at,
+                "last_orders_ok_at": self.last_orders_ok_at,
+                "last_price_ok_at": self.last_price_ok_at,
+                "last_ws_message_at": self.last_ws_message_at,
+                "last_reconciler_ok_at": self.last_reconciler_ok_at,
             }
+        for name in _SNAPSHOT_TIMESTAMP_KEYS:
+            value = snapshot[name]
+            snapshot[name] = value.isoformat() if value else None
+        snapshot["account"] = _record_dict(account, _ACCOUNT_FIELDS) if account else None
+        snapshot["positions"] = positions
+        snapshot["orders"] = orders
+        snapshot["local_guards"] = guards
+        snapshot["prices"] = {k: _record_dict(v, _PRICE_FIELDS) for k, v in prices}
+        snapshot["last_ws_snapshot_at_by_symbol"] = {k: v.isoformat() for k, v in ws_snapshot_at}
+        return snapshot
+
+    def _has_valid_stop_loss_locked(self, symbol: str, position_side: str) -> bool:
+        guard = self.local_guard_stops.get(_guard_key(symbol, position_side))
+        if guard and guard.active:
+            return True
+        return self._find_stop_loss_order_locked(symbol, position_side) is not None
+
+    def _find_stop_loss_order_locked(self, symbol: str, position_side: str) -> OrderState | None:
+        side = normalize_hold_side(position_side)
+        key = norm_symbol(symbol)
+        position = self.positions.get(key)
+        entry_price = None
+        if position is not None and position.side is side and position.entry_price is not None:
+            entry_price = float(position.entry_price)
+        is_long = side is HoldSide.LONG
+        hedge_close_side = close_side_for_hold(side, "hedge_mode")
+        one_way_close_side = close_side_for_hold(side, "one_way_mode")
+        for order in self._orders_for_symbol_locked(key):
+            if order.is_terminal:
+                continue
+            purpose = order.purpose_key
+            if purpose != "sl":
+                if purpose != "close" or order.trigger_price is None or entry_price is None:
+                    continue
+                # A plain close trigger only counts when it sits on the loss side of entry.
+                trigger_price = float(order.trigger_price)
+                if trigger_price > entry_price if is_long else trigger_price < entry_price:
+                    continue
+            if order.trade_side_key == "close":
+                expected_close_side = hedge_close_side
+            elif order.reduce_only:
+                expected_close_side = one_way_close_side
+            else:
+                continue
+            if order.side_key == expected_close_side:
+                return order
+        return None
+
+    def _invalidate_order_views_locked(self) -> None:
+        self._pending_cache = None
+        self._entry_symbols_cache = None
+
+    def _orders_for_symbol_locked(self, key: str) -> list[OrderState]:
+        bucket = self.orders_by_symbol.get(key)
+        if not bucket:
+            return []
+        # Same (client_oid, order_id) de-duplication as _all_orders_locked.
+        merged: dict[tuple[str | None, str | None], OrderState] = {}
+        for order in bucket.values():
+            merged[(order.client_order_id, order.order_id)] = order
+        return list(merged.values())
+
+    def _unindex_if_unreferenced_locked(self, order: OrderState) -> None:
+        if order.client_order_id and self.orders_by_client_id.get(order.client_order_id) is order:
+            return
+        if order.order_id and self.orders_by_exchange_id.get(order.order_id) is order:
+            return
+        bucket = self.orders_by_symbol.get(order.symbol_key)
+        if bucket is not None:
+            bucket.pop(id(order), None)
+            if not bucket:
+                del self.orders_by_symbol[order.symbol_key]
 
     def _all_orders_locked(self) -> list[OrderState]:
         # Merge client-id and exchange-id indices so manually created exchange orders
@@ -476,9 +628,69 @@ class StateStore:
         return list(merged.values())
 
 
+_SYMBOL_KEYS: dict[str, str] = {}
+_SYMBOL_KEYS_MAX = 4096
+
+
+def norm_symbol(symbol: str) -> str:
+    # Upper-cased symbol, memoized so repeated lookups reuse one string object.
+    key = _SYMBOL_KEYS.get(symbol)
+    if key is None:
+        if len(_SYMBOL_KEYS) >= _SYMBOL_KEYS_MAX:
+            _SYMBOL_KEYS.clear()
+        key = _SYMBOL_KEYS[symbol] = symbol.upper()
+    return key
+
+
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _guard_key(symbol: str, side: str) -> str:
-    return f"{symbol.upper()}::{side.lower()}"
+def _snapshot_fields(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.name not in _CACHED_KEY_FIELDS)
+
+
+# Record fields are all scalars/datetimes, so a flat getattr copy replaces
+# asdict()'s recursive deepcopy walk.
+_ACCOUNT_FIELDS = _snapshot_fields(AccountState)
+_POSITION_FIELDS = _snapshot_fields(PositionState)
+_ORDER_FIELDS = _snapshot_fields(OrderState)
+_GUARD_FIELDS = _snapshot_fields(LocalGuardStop)
+_PRICE_FIELDS = _snapshot_fields(PriceSnapshot)
+
+
+_SNAPSHOT_TIMESTAMP_KEYS = (
+    "last_account_ok_at",
+    "last_positions_ok_at",
+    "last_orders_ok_at",
+    "last_price_ok_at",
+    "last_ws_message_at",
+    "last_reconciler_ok_at",
+)
+
+
+def _record_dict(obj: Any, names: tuple[str, ...]) -> dict[str, Any]:
+    return {name: getattr(obj, name) for name in names}
+
+
+_RECORD_FIELDS: dict[type, tuple[str, ...]] = {
+    AccountState: _ACCOUNT_FIELDS,
+    PositionState: _POSITION_FIELDS,
+    OrderState: _ORDER_FIELDS,
+    LocalGuardStop: _GUARD_FIELDS,
+    PriceSnapshot: _PRICE_FIELDS,
+}
+
+
+def record_payload(record: Any) -> dict[str, Any]:
+    """Persistable dict of a state record, without the cached lookup keys."""
+    return _record_dict(record, _RECORD_FIELDS[type(record)])
+
+
+def _position_fingerprint(p: PositionState) -> tuple[Any, ...]:
+    return (p.side, p.size, p.entry_price, p.mark_price, p.liq_price)
+
+
+def _guard_key(symbol: str, side: str) -> tuple[str, HoldSide]:
+    # Interned symbol plus a HoldSide member: hashing needs no string formatting.
+    return norm_symbol(symbol), normalize_hold_side(side)
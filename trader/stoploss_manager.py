@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import datetime, timezone
 
 from trader.alerts import AlertManager
 from trader.bitget_client import BitgetClient
 from trader.config import AppConfig
-from trader.side_mapper import close_side_for_hold, normalize_hold_side
+from trader.order_ids import mint_client_oid, new_trace_id
+from trader.side_mapper import HoldSide, close_side_for_hold
 from trader.state import LocalGuardStop, OrderState, PositionState, StateStore, utc_now
 from trader.store import SQLiteStore
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TRIGGER_PRICE_REL_TOL = 0.0001
 
-@dataclass
+
+def _trigger_price_matches(current: float, desired: float) -> bool:
+    # Same as abs(current - desired) <= max(abs(desired), 1.0) * tol, without the builtin calls.
+    diff = current - desired
+    scale = desired if desired >= 0 else -desired
+    tol = (scale if scale > 1.0 else 1.0) * _TRIGGER_PRICE_REL_TOL
+    return -tol <= diff <= tol
+
+
+@dataclass(slots=True)
 class StopLossResult:
     ok: bool
     mode: str
@@ -37,6 +50,20 @@ class StopLossManager:
         self.state = state
         self.store = store
         self.alerts = alerts
+        # position_mode is fixed for the process; derive the SL order shape once.
+        position_mode = config.bitget.position_mode
+        self._sl_reduce_only = position_mode == "one_way_mode"
+        self._sl_trade_side = "close" if position_mode == "hedge_mode" else None
+        self._close_side = {side: close_side_for_hold(side, position_mode) for side in HoldSide}
+        # default_stop_loss_pct accepts percent (0.6) or ratio (0.006) notation.
+        default_sl_ratio = config.risk.default_stop_loss_pct
+        if default_sl_ratio > 0.05:
+            default_sl_ratio = default_sl_ratio / 100.0
+        self._default_sl_long_factor = 1 - default_sl_ratio
+        self._default_sl_short_factor = 1 + default_sl_ratio
+        # Resolved once; the client itself TTL-caches the capability answer.
+        probe = getattr(bitget, "supports_plan_orders", None)
+        self._plan_support_probe = probe if callable(probe) else None
 
     def ensure_stop_loss(
         self,
@@ -64,30 +91,29 @@ class StopLossManager:
 
         # High-frequency SL checks can happen every poll tick; avoid emitting a
         # verbose attempt event each time and keep only result events.
-        trace = uuid.uuid4().hex[:12]
+        trace = new_trace_id()
 
         existing = self.state.get_stop_loss_order(position_state.symbol, position_state.side)
         if existing is not None:
             ok, reason = self.validate_existing_sl(position_state, existing)
-            if ok:
-                if (
-                    desired_sl_price is not None
-                    and existing.trigger_price is not None
-                    and abs(existing.trigger_price - desired_sl_price) > max(abs(desired_sl_price), 1.0) * 0.0001
-                ):
-                    self._cancel_existing_sl(existing, trace, "sl_trigger_price_mismatch")
-                else:
-                    return StopLossResult(
-                        ok=True,
-                        mode="existing",
-                        reason="already_covered",
-                        trace_id=trace,
-                        order_id=existing.order_id,
-                        client_order_id=existing.client_order_id,
-                        elapsed_ms=self._elapsed_ms(started_at),
-                    )
             if not ok:
                 self._cancel_existing_sl(existing, trace, reason)
+            elif (
+                desired_sl_price is not None
+                and existing.trigger_price is not None
+                and not _trigger_price_matches(existing.trigger_price, desired_sl_price)
+            ):
+                self._cancel_existing_sl(existing, trace, "sl_trigger_price_mismatch")
+            else:
+                return StopLossResult(
+                    ok=True,
+                    mode="existing",
+                    reason="already_covered",
+                    trace_id=trace,
+                    order_id=existing.order_id,
+                    client_order_id=existing.client_order_id,
+                    elapsed_ms=self._elapsed_ms(started_at),
+                )
 
         trigger_price = desired_sl_price if desired_sl_price is not None else self._default_sl_price(position_state)
         if trigger_price <= 0:
@@ -130,7 +156,7 @@ class StopLossManager:
             return StopLossResult(ok=False, mode="none", reason="entry_price_missing", trace_id=trace)
 
         base = position_state.entry_price
-        if position_state.side.lower() == "long":
+        if position_state.side is HoldSide.LONG:
             be_price = base * (1 + buffer_pct)
         else:
             be_price = base * (1 - buffer_pct)
@@ -143,11 +169,11 @@ class StopLossManager:
         )
 
     def validate_existing_sl(self, position_state: PositionState, sl_order_state: OrderState) -> tuple[bool, str]:
-        expected_close_side = close_side_for_hold(position_state.side, self.config.bitget.position_mode)
-        if sl_order_state.side.lower() != expected_close_side:
+        expected_close_side = self._close_side[position_state.side]
+        if sl_order_state.side_key != expected_close_side:
             return False, f"sl_side_mismatch: expected {expected_close_side}"
 
-        if not sl_order_state.reduce_only and (sl_order_state.trade_side or "").lower() != "close":
+        if not sl_order_state.reduce_only and sl_order_state.trade_side_key != "close":
             return False, "sl_not_reduce_only_or_close"
 
         if sl_order_state.quantity is not None and position_state.size > 0:
@@ -161,89 +187,121 @@ class StopLossManager:
         return True, "ok"
 
     def process_local_guards(self) -> None:
+        if not self.state.active_local_guard_count:
+            return
         guards = self.state.active_local_guards()
+        if not guards:
+            return
+        snaps = self.state.get_prices({guard.symbol for guard in guards})
+        # Detect first in a tight loop (sides are HoldSide members, so this is
+        # identity checks and float compares); only fired guards pay for I/O.
+        fired: list[tuple[LocalGuardStop, float]] = []
         for guard in guards:
-            snap = self.state.get_price(guard.symbol)
+            snap = snaps.get(guard.symbol)
             if snap is None:
                 continue
             px = snap.mark if snap.mark is not None else snap.last
             if px is None:
                 continue
+            if px <= guard.trigger_price if guard.side is HoldSide.LONG else px >= guard.trigger_price:
+                fired.append((guard, px))
 
-            trigger = False
-            if guard.side.lower() == "long" and px <= guard.trigger_price:
-                trigger = True
-            if guard.side.lower() == "short" and px >= guard.trigger_price:
-                trigger = True
-            if not trigger:
-                continue
-
-            trace = self.alerts.critical(
-                "LOCAL_GUARD_TRIGGERED",
-                "local guard stop-loss triggered",
-                {
-                    "symbol": guard.symbol,
-                    "purpose": "emergency_close",
-                    "reason": guard.reason,
-                    "trigger_price": guard.trigger_price,
-                    "observed_price": px,
-                },
-            )
-            if not self.config.execution.close_on_invariant_violation:
-                self.store.record_reconciler_action(
-                    symbol=guard.symbol,
-                    order_id=None,
-                    client_order_id=None,
-                    action="LOCAL_GUARD_TRIGGER_REPORT_ONLY",
-                    reason=guard.reason,
-                    payload={"trigger_price": guard.trigger_price, "observed_price": px, "size": guard.size},
-                    trace_id=trace,
-                )
-                self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
-                continue
-
-            if self.config.dry_run:
-                self.store.record_reconciler_action(
-                    symbol=guard.symbol,
-                    order_id=None,
-                    client_order_id=None,
-                    action="LOCAL_GUARD_TRIGGER_DRY_RUN",
-                    reason=guard.reason,
-                    payload={"trigger_price": guard.trigger_price, "observed_price": px},
-                    trace_id=trace,
+        if not fired:
+            return
+        # Raise the trigger alerts before closing so they are not held up by the
+        # exchange round-trips; close outcomes are reported per guard below. A
+        # crash can fire many guards at once, so audit rows commit together.
+        with self.store.deferred_commits():
+            traces = [
+                self.alerts.critical(
+                    "LOCAL_GUARD_TRIGGERED",
+                    "local guard stop-loss triggered",
+                    {
+                        "symbol": guard.symbol,
+                        "purpose": "emergency_close",
+                        "reason": guard.reason,
+                        "trigger_price": guard.trigger_price,
+                        "observed_price": px,
+                    },
                 )
-                self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
-                continue
+                for guard, px in fired
+            ]
+        close_errors: list[Exception | None] = [None] * len(fired)
+        if self.config.execution.close_on_invariant_violation and not self.config.dry_run:
+            close_errors = self._close_fired_guards([guard for guard, _ in fired])
+        with self.store.deferred_commits():
+            for (guard, px), trace, close_error in zip(fired, traces, close_errors):
+                if not self.config.execution.close_on_invariant_violation:
+                    self.store.record_reconciler_action(
+                        symbol=guard.symbol,
+                        order_id=None,
+                        client_order_id=None,
+                        action="LOCAL_GUARD_TRIGGER_REPORT_ONLY",
+                        reason=guard.reason,
+                        payload={"trigger_price": guard.trigger_price, "observed_price": px, "size": guard.size},
+                        trace_id=trace,
+                    )
+                    self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
+                    continue
+
+                if self.config.dry_run:
+                    self.store.record_reconciler_action(
+                        symbol=guard.symbol,
+                        order_id=None,
+                        client_order_id=None,
+                        action="LOCAL_GUARD_TRIGGER_DRY_RUN",
+                        reason=guard.reason,
+                        payload={"trigger_price": guard.trigger_price, "observed_price": px},
+                        trace_id=trace,
+                    )
+                    self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
+                    continue
+
+                if close_error is None:
+                    self.store.record_reconciler_action(
+                        symbol=guard.symbol,
+                        order_id=None,
+                        client_order_id=None,
+                        action="LOCAL_GUARD_TRIGGER_CLOSE",
+                        reason=guard.reason,
+                        payload={"trigger_price": guard.trigger_price, "observed_price": px, "size": guard.size},
+                        trace_id=trace,
+                    )
+                    self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
+                    continue
 
-            try:
-                self.bitget.protective_close_position(guard.symbol, guard.side, guard.size)
-                self.store.record_reconciler_action(
-                    symbol=guard.symbol,
-                    order_id=None,
-                    client_order_id=None,
-                    action="LOCAL_GUARD_TRIGGER_CLOSE",
-                    reason=guard.reason,
-                    payload={"trigger_price": guard.trigger_price, "observed_price": px, "size": guard.size},
-                    trace_id=trace,
-                )
-                self.state.deactivate_local_guard_stop(guard.symbol, guard.side)
-            except Exception as exc:  # noqa: BLE001
                 self.state.register_api_error()
                 self.store.record_reconciler_action(
                     symbol=guard.symbol,
                     order_id=None,
                     client_order_id=None,
                     action="LOCAL_GUARD_TRIGGER_FAILED",
-                    reason=str(exc),
+                    reason=str(close_error),
                     payload={"trigger_price": guard.trigger_price, "observed_price": px, "size": guard.size},
                     trace_id=trace,
                 )
                 self.alerts.error(
                     "LOCAL_GUARD_TRIGGER_FAILED",
                     "local guard close failed",
-                    {"symbol": guard.symbol, "purpose": "emergency_close", "reason": str(exc)},
+                    {"symbol": guard.symbol, "purpose": "emergency_close", "reason": str(close_error)},
                 )
 
+    def _close_fired_guards(self, guards: list[LocalGuardStop]) -> list[Exception | None]:
+        def close(guard: LocalGuardStop) -> Exception | None:
+            try:
+                self.bitget.protective_close_position(guard.symbol, guard.side, guard.size)
+            except Exception as exc:  # noqa: BLE001
+                return exc
+            return None
+
+        if len(guards) == 1:
+            return [close(guards[0])]
+        # Overlap the REST round-trips when several guards fire in the same tick;
+        # the client's rate limiter is thread-safe and still paces the requests.
+        workers = min(len(guards), self.config.risk.stoploss.max_concurrent_guard_closes)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="guard-close") as pool:
+            return list(pool.map(close, guards))
+
     def _place_exchange_trigger_sl(
         self,
         *,
@@ -255,28 +313,23 @@ class StopLossManager:
         trace_id: str,
         started_at: float,
     ) -> StopLossResult:
-        hold_side = normalize_hold_side(position_state.side)
-        close_side = close_side_for_hold(hold_side, self.config.bitget.position_mode)
-        reduce_only = self.config.bitget.position_mode == "one_way_mode"
-        trade_side = "close" if self.config.bitget.position_mode == "hedge_mode" else None
-        client_oid = f"sl-{uuid.uuid4().hex[:16]}"
+        hold_side = position_state.side
+        close_side = self._close_side[hold_side]
+        reduce_only = self._sl_reduce_only
+        trade_side = self._sl_trade_side
+        client_oid = mint_client_oid("sl")
 
         if self.config.dry_run:
-            sl_order = OrderState(
+            sl_order = self._make_sl_order(
                 symbol=position_state.symbol,
                 side=close_side,
                 status="ACKED",
-                filled=0.0,
-                quantity=size,
-                avg_price=None,
+                size=size,
                 reduce_only=reduce_only,
                 trade_side=trade_side,
-                purpose="sl",
-                timestamp=utc_now(),
-                client_order_id=client_oid,
+                client_oid=client_oid,
                 order_id=f"dry-{client_oid}",
                 trigger_price=trigger_price,
-                is_plan_order=True,
                 parent_client_order_id=parent_client_order_id,
             )
             self.state.upsert_order(sl_order)
@@ -316,21 +369,16 @@ class StopLossManager:
                 client_oid=client_oid,
                 trigger_type=self.config.risk.stoploss.trigger_price_type,
             )
-            sl_order = OrderState(
+            sl_order = self._make_sl_order(
                 symbol=position_state.symbol,
                 side=close_side,
                 status=ack.status or "ACKED",
-                filled=0.0,
-                quantity=size,
-                avg_price=None,
+                size=size,
                 reduce_only=reduce_only,
                 trade_side=trade_side,
-                purpose="sl",
-                timestamp=utc_now(),
-                client_order_id=ack.client_oid or client_oid,
+                client_oid=ack.client_oid or client_oid,
                 order_id=ack.order_id,
                 trigger_price=trigger_price,
-                is_plan_order=True,
                 parent_client_order_id=parent_client_order_id,
             )
             self.state.upsert_order(sl_order)
@@ -396,6 +444,39 @@ class StopLossManager:
                 elapsed_ms=self._elapsed_ms(started_at),
             )
 
+    @staticmethod
+    def _make_sl_order(
+        *,
+        symbol: str,
+        side: str,
+        status: str,
+        size: float,
+        reduce_only: bool,
+        trade_side: str | None,
+        client_oid: str,
+        order_id: str | None,
+        trigger_price: float,
+        parent_client_order_id: str | None,
+    ) -> OrderState:
+        # upsert_order stamps the timestamp, so the placeholder avoids a utc_now() call.
+        return OrderState(
+            symbol=symbol,
+            side=side,
+            status=status,
+            filled=0.0,
+            quantity=size,
+            avg_price=None,
+            reduce_only=reduce_only,
+            trade_side=trade_side,
+            purpose="sl",
+            timestamp=_EPOCH,
+            client_order_id=client_oid,
+            order_id=order_id,
+            trigger_price=trigger_price,
+            is_plan_order=True,
+            parent_client_order_id=parent_client_order_id,
+        )
+
     def _arm_local_guard(
         self,
         *,
@@ -417,16 +498,16 @@ class StopLossManager:
         )
         self.state.register_local_guard_stop(guard)
 
-        client_oid = f"local-guard-{uuid.uuid4().hex[:12]}"
+        client_oid = mint_client_oid("local-guard")
         pseudo_order = OrderState(
             symbol=position_state.symbol,
-            side=close_side_for_hold(position_state.side, self.config.bitget.position_mode),
+            side=self._close_side[position_state.side],
             status="LOCAL_GUARD_ACTIVE",
             filled=0.0,
             quantity=size,
             avg_price=None,
             reduce_only=True,
-            trade_side="close" if self.config.bitget.position_mode == "hedge_mode" else None,
+            trade_side=self._sl_trade_side,
             purpose="sl",
             timestamp=utc_now(),
             client_order_id=client_oid,
@@ -527,21 +608,18 @@ class StopLossManager:
 
     def _default_sl_price(self, position: PositionState) -> float:
         base = position.entry_price or position.mark_price or 0.0
-        ratio = self.config.risk.default_stop_loss_pct
-        if ratio > 0.05:
-            ratio = ratio / 100.0
-        if position.side.lower() == "long":
-            return base * (1 - ratio)
-        return base * (1 + ratio)
+        if position.side is HoldSide.LONG:
+            return base * self._default_sl_long_factor
+        return base * self._default_sl_short_factor
 
     def _supports_plan_orders(self) -> bool:
-        fn = getattr(self.bitget, "supports_plan_orders", None)
-        if callable(fn):
-            try:
-                return bool(fn())
-            except Exception:  # noqa: BLE001
-                return False
-        return False
+        probe = self._plan_support_probe
+        if probe is None:
+            return False
+        try:
+            return bool(probe())
+        except Exception:  # noqa: BLE001
+            return False
 
     @staticmethod
     def _elapsed_ms(started_at: float) -> int:
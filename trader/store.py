@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import hashlib
 import json
+import math
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,6 +16,102 @@ from typing import Any
 
 from trader.models import ParsedMessage
 
+try:
+    import orjson
+except ImportError:  # optional speedup; _dumps pins the document format either way
+    orjson = None  # type: ignore[assignment]
+
+
+_LEGACY_TEXT_HASH_LEN = 64
+_LLM_PARSE_CACHE_MAX = 4096
+# PRAGMA user_version once the _init_schema column migrations have run.
+_SCHEMA_VERSION = 2
+# Identical resends within this window skip the message_state last_seen write.
+_LAST_SEEN_DEBOUNCE_SECONDS = 60.0
+_RECENT_MESSAGES_MAX = 65536
+# Refresh planner statistics (PRAGMA optimize) after this many commits.
+_OPTIMIZE_EVERY_COMMITS = 10_000
+_UTC = timezone.utc
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # Headroom over the default 128 statements so per-table PRAGMA/migration
+    # statements never evict the hot insert statements.
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode is persistent and set once by
+    # _init_schema. Under WAL, NORMAL is durable against app crashes: only an
+    # OS crash can roll back the last commits, which replay from Telegram anyway.
+    conn.executescript(
+        """
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA busy_timeout=60000;
+        """
+    )
+    return conn
+
+
+def _dumps(payload: Any) -> str:
+    # Both encoders must write the same document: datetimes go through str()
+    # ("2026-01-01 00:00:00+00:00") and NaN/Infinity become null.
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                payload,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode("utf-8")
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; let the stdlib encoder handle it
+    try:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default, allow_nan=False)
+    except ValueError:
+        return json.dumps(_finite(payload), ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def _json_default(obj: Any) -> Any:
+    # _json hands orjson raw dataclasses; the stdlib fallback must expand them.
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of obj with NaN/Infinity floats replaced by None, as orjson writes them."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if is_dataclass(obj) and not isinstance(obj, type):
+        obj = asdict(obj)
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def _loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass  # rows written by the stdlib encoder may hold NaN/Infinity
+    return json.loads(raw)
+
+
+def _text_hash(text: str | None) -> str:
+    # Dedup/cache key only; no cryptographic property needed.
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _is_legacy_text_hash_match(stored: str, text: str | None) -> bool:
+    """Rows written before the blake2b switch hold a sha256 hex digest."""
+    if len(stored) != _LEGACY_TEXT_HASH_LEN:
+        return False
+    return stored == hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
 
 @dataclass
 class MessageRecordResult:
@@ -23,16 +125,47 @@ class SQLiteStore:
     def __init__(self, db_path: str) -> None:
         path = Path(db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = _connect(path)
+        # Every thread writes through self.conn, so its transaction state is
+        # shared: a commit from one thread would publish another thread's
+        # half-finished batch. Writers hold _write_lock for each write, and
+        # deferred_commits()/transaction() hold it from entry until the
+        # outermost block commits or rolls back.
+        self._write_lock = threading.RLock()
+        # Per-thread nesting depth of deferred_commits()/transaction().
+        self._deferred = threading.local()
+        # Per-thread read-only connections for hot lookups (WAL lets them read
+        # while the shared connection writes). In-memory DBs cannot be shared
+        # across connections, so they keep reading through self.conn.
+        self._path = path
+        self._use_readers = str(db_path) != ":memory:"
+        self._readers = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+        # Decoded llm_parses rows by (chat_id, message_id, version, text_hash),
+        # least recently used first. Values are shared; callers only read them.
+        self._llm_parse_cache: OrderedDict[tuple[int, int, int, str], dict[str, Any]] = OrderedDict()
+        self._llm_parse_cache_lock = threading.Lock()
+        self._commits_since_optimize = 0
+        # (chat_id, message_id) -> (text_hash, committed result, monotonic time
+        # last_seen was written); only holds state that is already committed.
+        self._recent_messages: OrderedDict[tuple[int, int], tuple[str, MessageRecordResult, float]] = OrderedDict()
+        self._recent_messages_lock = threading.Lock()
         self._init_schema()
 
     def _init_schema(self) -> None:
         cur = self.conn.cursor()
         cur.executescript(
             """
+            -- page_size only takes effect on a brand-new file (before the first
+            -- table); existing WAL databases ignore it.
+            PRAGMA page_size=8192;
             PRAGMA journal_mode=WAL;
+            PRAGMA wal_autocheckpoint=1000;
 
+            -- message_state and system_flags: WITHOUT ROWID stores rows in the primary-key
+            -- B-tree itself (one seek, no autoindex). Files created before this
+            -- keep their rowid layout, which behaves identically.
             CREATE TABLE IF NOT EXISTS message_state (
                 chat_id INTEGER NOT NULL,
                 message_id INTEGER NOT NULL,
@@ -41,7 +174,7 @@ class SQLiteStore:
                 first_seen TEXT NOT NULL,
                 last_seen TEXT NOT NULL,
                 PRIMARY KEY(chat_id, message_id)
-            );
+            ) WITHOUT ROWID;
 
             CREATE TABLE IF NOT EXISTS message_versions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -100,7 +233,8 @@ class SQLiteStore:
                 status TEXT NOT NULL,
                 reason TEXT,
                 intent_json TEXT,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                created_at_ms INTEGER
             );
 
             CREATE TABLE IF NOT EXISTS order_receipts (
@@ -214,34 +348,68 @@ class SQLiteStore:
                 key TEXT PRIMARY KEY,
                 value TEXT,
                 updated_at TEXT NOT NULL
-            );
+            ) WITHOUT ROWID;
+
+            -- Hot "latest row" lookups; id is the rowid, so it is implicitly the
+            -- trailing index key and ORDER BY id DESC walks the index backwards.
+            CREATE INDEX IF NOT EXISTS idx_executions_symbol_side ON executions(symbol, side);
+            CREATE INDEX IF NOT EXISTS idx_parsed_signals_chat_type
+                ON parsed_signals(chat_id, signal_type) WHERE symbol IS NOT NULL;
+            -- Duplicate-message check (has_message_processing_records).
+            CREATE INDEX IF NOT EXISTS idx_parsed_signals_msg ON parsed_signals(chat_id, message_id, version);
+            CREATE INDEX IF NOT EXISTS idx_executions_msg ON executions(chat_id, message_id, version);
+            CREATE INDEX IF NOT EXISTS idx_trade_threads_symbol_updated ON trade_threads(symbol, updated_at);
+            -- MAX(equity) becomes a single rightmost-entry seek; the partial index
+            -- holds only live threads, so counting them skips closed history.
+            CREATE INDEX IF NOT EXISTS idx_equity_snapshots_equity ON equity_snapshots(equity);
+            CREATE INDEX IF NOT EXISTS idx_trade_threads_active
+                ON trade_threads(status) WHERE status IN ('ACTIVE', 'PARTIAL', 'PENDING_ENTRY', 'RUNNING');
             """
         )
 
-        # Lightweight migration support for older DBs.
-        self._ensure_column("parsed_signals", "parse_source", "TEXT")
-        self._ensure_column("parsed_signals", "confidence", "REAL")
-        self._ensure_column("executions", "thread_id", "INTEGER")
-        self._ensure_column("executions", "purpose", "TEXT")
-        self._ensure_column("events", "reason", "TEXT")
-        self._ensure_column("events", "thread_id", "INTEGER")
-        self._ensure_column("reconciler_actions", "thread_id", "INTEGER")
-        self._ensure_column("reconciler_actions", "purpose", "TEXT")
-        self._ensure_column("trade_threads", "target_version", "INTEGER NOT NULL DEFAULT 1")
-        self._ensure_column("trade_threads", "stop_loss", "REAL")
-        self._ensure_column("trade_threads", "entry_points_json", "TEXT")
-        self._ensure_column("trade_threads", "tp_points_json", "TEXT")
-        self._ensure_column("trade_threads", "filled_tp_points_json", "TEXT")
+        # Lightweight migration support for older DBs. Bump _SCHEMA_VERSION
+        # whenever a column is added here so already-migrated files re-check.
+        if int(cur.execute("PRAGMA user_version").fetchone()[0]) < _SCHEMA_VERSION:
+            self._ensure_columns("parsed_signals", {"parse_source": "TEXT", "confidence": "REAL"})
+            self._ensure_columns(
+                "executions", {"thread_id": "INTEGER", "purpose": "TEXT", "created_at_ms": "INTEGER"}
+            )
+            # Backfill epoch millis from the ISO text (julianday accepts the +00:00 offset).
+            cur.execute(
+                """
+                UPDATE executions
+                SET created_at_ms = CAST(round((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER)
+                WHERE created_at_ms IS NULL
+                """
+            )
+            self._ensure_columns("events", {"reason": "TEXT", "thread_id": "INTEGER"})
+            self._ensure_columns("reconciler_actions", {"thread_id": "INTEGER", "purpose": "TEXT"})
+            self._ensure_columns(
+                "trade_threads",
+                {
+                    "target_version": "INTEGER NOT NULL DEFAULT 1",
+                    "stop_loss": "REAL",
+                    "entry_points_json": "TEXT",
+                    "tp_points_json": "TEXT",
+                    "filled_tp_points_json": "TEXT",
+                },
+            )
+            cur.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        # Needs executions.thread_id, which older files only gain above.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_executions_thread_action ON executions(thread_id, action_type)"
+        )
         self._ensure_thread_messages_chat_scope()
 
-        self.conn.commit()
+        self._commit()
 
-    def _ensure_column(self, table: str, column: str, column_type: str) -> None:
+    def _ensure_columns(self, table: str, columns: dict[str, str]) -> None:
         cur = self.conn.cursor()
         cur.execute(f"PRAGMA table_info({table})")
         existing = {str(row[1]) for row in cur.fetchall()}
-        if column not in existing:
-            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        for column, column_type in columns.items():
+            if column not in existing:
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
 
     def _ensure_thread_messages_chat_scope(self) -> None:
         cur = self.conn.cursor()
@@ -317,54 +485,97 @@ class SQLiteStore:
         is_edit: bool,
         event_time: datetime | None,
     ) -> MessageRecordResult:
-        now = self._now_iso()
-        text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
-
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT last_hash, latest_version FROM message_state WHERE chat_id=? AND message_id=?",
-            (chat_id, message_id),
-        )
-        row = cur.fetchone()
+        text_hash = _text_hash(text)
+        key = (chat_id, message_id)
+        with self._recent_messages_lock:
+            recent = self._recent_messages.get(key)
+        if (
+            recent is not None
+            and recent[0] == text_hash
+            and time.monotonic() - recent[2] < _LAST_SEEN_DEBOUNCE_SECONDS
+        ):
+            seen = recent[1]
+            return MessageRecordResult(
+                duplicate=True, version=seen.version, text_changed=False, text_hash=seen.text_hash
+            )
 
-        if row is None:
-            version = 1
+        # Inside an outer transaction the rows may still roll back, so only
+        # remember results this call commits itself; a nested write still
+        # drops the entry, since it may have moved last_hash/version on.
+        outermost = not getattr(self._deferred, "depth", 0)
+        result = self._upsert_message_state(chat_id, message_id, text, is_edit, event_time, text_hash)
+        with self._recent_messages_lock:
+            if not outermost:
+                self._recent_messages.pop(key, None)
+            else:
+                self._recent_messages[key] = (text_hash, result, time.monotonic())
+                self._recent_messages.move_to_end(key)
+                if len(self._recent_messages) > _RECENT_MESSAGES_MAX:
+                    self._recent_messages.popitem(last=False)
+        return result
+
+    def _upsert_message_state(
+        self,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        is_edit: bool,
+        event_time: datetime | None,
+        text_hash: str,
+    ) -> MessageRecordResult:
+        now = self._now_iso()
+        with self.transaction():
+            cur = self.conn.cursor()
+            # Every DB round refreshes last_seen, so the touch doubles as the lookup:
+            # RETURNING yields the pre-existing hash/version (neither is modified
+            # here), and duplicates finish in this one statement.
             cur.execute(
                 """
-                INSERT INTO message_state(chat_id, message_id, last_hash, latest_version, first_seen, last_seen)
-                VALUES(?,?,?,?,?,?)
+                UPDATE message_state SET last_seen=? WHERE chat_id=? AND message_id=?
+                RETURNING last_hash, latest_version
                 """,
-                (chat_id, message_id, text_hash, version, now, now),
-            )
-            self._insert_message_version(chat_id, message_id, version, is_edit, text_hash, text, event_time)
-            self.conn.commit()
-            return MessageRecordResult(duplicate=False, version=version, text_changed=True, text_hash=text_hash)
-
-        if row["last_hash"] == text_hash:
-            cur.execute(
-                "UPDATE message_state SET last_seen=? WHERE chat_id=? AND message_id=?",
                 (now, chat_id, message_id),
             )
-            self.conn.commit()
-            return MessageRecordResult(
-                duplicate=True,
-                version=int(row["latest_version"]),
-                text_changed=False,
-                text_hash=text_hash,
+            row = cur.fetchone()
+
+            if row is None:
+                version = 1
+                cur.execute(
+                    """
+                    INSERT INTO message_state(chat_id, message_id, last_hash, latest_version, first_seen, last_seen)
+                    VALUES(?,?,?,?,?,?)
+                    """,
+                    (chat_id, message_id, text_hash, version, now, now),
+                )
+                self._insert_message_version(chat_id, message_id, version, is_edit, text_hash, text, event_time, now)
+                return MessageRecordResult(duplicate=False, version=version, text_changed=True, text_hash=text_hash)
+
+            last_hash = str(row["last_hash"])
+            if last_hash == text_hash or _is_legacy_text_hash_match(last_hash, text):
+                return MessageRecordResult(
+                    duplicate=True,
+                    version=int(row["latest_version"]),
+                    text_changed=False,
+                    # Keep the stored hash so LLM cache rows written under it still hit.
+                    text_hash=last_hash,
+                )
+
+            version = int(row["latest_version"]) + 1
+            cur.execute(
+                "UPDATE message_state SET last_hash=?, latest_version=? WHERE chat_id=? AND message_id=?",
+                (text_hash, version, chat_id, message_id),
             )
+            self._insert_message_version(chat_id, message_id, version, is_edit, text_hash, text, event_time, now)
+            return MessageRecordResult(duplicate=False, version=version, text_changed=True, text_hash=text_hash)
 
-        version = int(row["latest_version"]) + 1
-        cur.execute(
-            """
-            UPDATE message_state
-            SET last_hash=?, latest_version=?, last_seen=?
-            WHERE chat_id=? AND message_id=?
-            """,
-            (text_hash, version, now, chat_id, message_id),
-        )
-        self._insert_message_version(chat_id, message_id, version, is_edit, text_hash, text, event_time)
-        self.conn.commit()
-        return MessageRecordResult(duplicate=False, version=version, text_changed=True, text_hash=text_hash)
+    def record_messages_bulk(
+        self,
+        items: list[tuple[int, int, str, bool, datetime | None]],
+    ) -> list[MessageRecordResult]:
+        """record_message() for (chat_id, message_id, text, is_edit, event_time)
+        tuples in order, committed as one transaction (backfill/replay)."""
+        with self.transaction():
+            return [self.record_message(*item) for item in items]
 
     def _insert_message_version(
         self,
@@ -375,6 +586,7 @@ class SQLiteStore:
         text_hash: str,
         text: str,
         event_time: datetime | None,
+        created_at: str,
     ) -> None:
         self.conn.execute(
             """
@@ -389,7 +601,7 @@ class SQLiteStore:
                 text_hash,
                 text,
                 self._iso(event_time),
-                self._now_iso(),
+                created_at,
             ),
         )
 
@@ -402,41 +614,31 @@ class SQLiteStore:
         parse_source: str = "RULES",
         confidence: float | None = None,
     ) -> None:
-        payload = self._json(parsed)
-        symbol = payload.get("symbol")
-        kind = payload.get("kind", "UNKNOWN")
-        if hasattr(kind, "value"):
-            kind = kind.value
-
-        side = payload.get("side")
-        if isinstance(side, dict) and "value" in side:
-            side_value = side["value"]
-        elif hasattr(side, "value"):
-            side_value = side.value
-        else:
-            side_value = side
+        with self._write_lock:
+            kind, symbol, side_value = self._signal_fields(parsed)
+            payload = self._json(parsed)
 
-        self.conn.execute(
-            """
-            INSERT INTO parsed_signals(
-                chat_id, message_id, version, signal_type, symbol, side, parse_source, confidence, payload_json, created_at
+            self.conn.execute(
+                """
+                INSERT INTO parsed_signals(
+                    chat_id, message_id, version, signal_type, symbol, side, parse_source, confidence, payload_json, created_at
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    chat_id,
+                    message_id,
+                    version,
+                    kind,
+                    symbol,
+                    side_value,
+                    parse_source,
+                    confidence,
+                    _dumps(payload),
+                    self._now_iso(),
+                ),
             )
-            VALUES(?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                chat_id,
-                message_id,
-                version,
-                kind,
-                symbol,
-                side_value,
-                parse_source,
-                confidence,
-                json.dumps(payload, ensure_ascii=False, default=str),
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
+            self._commit()
 
     def get_llm_parse_cache(
         self,
@@ -445,7 +647,13 @@ class SQLiteStore:
         version: int,
         text_hash: str,
     ) -> dict[str, Any] | None:
-        cur = self.conn.cursor()
+        key = (chat_id, message_id, version, text_hash)
+        with self._llm_parse_cache_lock:
+            cached = self._llm_parse_cache.get(key)
+            if cached is not None:
+                self._llm_parse_cache.move_to_end(key)
+                return cached
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT response_json
@@ -458,7 +666,9 @@ class SQLiteStore:
         row = cur.fetchone()
         if row is None:
             return None
-        return json.loads(row["response_json"])
+        payload = _loads(row["response_json"])
+        self._remember_llm_parse(key, payload)
+        return payload
 
     def save_llm_parse(
         self,
@@ -472,30 +682,53 @@ class SQLiteStore:
         sanitized_text: str,
         response_payload: dict[str, Any],
     ) -> None:
-        self.conn.execute(
-            """
-            INSERT OR REPLACE INTO llm_parses(
-                chat_id, message_id, version, text_hash, provider, model, raw_text, sanitized_text,
-                response_json, kind, confidence, created_at
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT INTO llm_parses(
+                    chat_id, message_id, version, text_hash, provider, model, raw_text, sanitized_text,
+                    response_json, kind, confidence, created_at
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+                ON CONFLICT(chat_id, message_id, version, text_hash) DO UPDATE SET
+                    provider=excluded.provider,
+                    model=excluded.model,
+                    raw_text=excluded.raw_text,
+                    sanitized_text=excluded.sanitized_text,
+                    response_json=excluded.response_json,
+                    kind=excluded.kind,
+                    confidence=excluded.confidence,
+                    created_at=excluded.created_at
+                """,
+                (
+                    chat_id,
+                    message_id,
+                    version,
+                    text_hash,
+                    provider,
+                    model,
+                    raw_text,
+                    sanitized_text,
+                    _dumps(response_payload),
+                    response_payload.get("kind"),
+                    float(response_payload.get("confidence", 0.0)),
+                    self._now_iso(),
+                ),
             )
-            VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                chat_id,
-                message_id,
-                version,
-                text_hash,
-                provider,
-                model,
-                raw_text,
-                sanitized_text,
-                json.dumps(response_payload, ensure_ascii=False, default=str),
-                response_payload.get("kind"),
-                float(response_payload.get("confidence", 0.0)),
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
+            self._commit()
+            self._remember_llm_parse((chat_id, message_id, version, text_hash), response_payload)
+
+    def _remember_llm_parse(self, key: tuple[int, int, int, str], payload: dict[str, Any]) -> None:
+        # As with _recent_messages: inside an outer transaction the row may still
+        # roll back, so only cache committed state and drop anything older.
+        with self._llm_parse_cache_lock:
+            if getattr(self._deferred, "depth", 0):
+                self._llm_parse_cache.pop(key, None)
+                return
+            self._llm_parse_cache[key] = payload
+            self._llm_parse_cache.move_to_end(key)
+            if len(self._llm_parse_cache) > _LLM_PARSE_CACHE_MAX:
+                self._llm_parse_cache.popitem(last=False)
 
     def record_execution(
         self,
@@ -511,34 +744,38 @@ class SQLiteStore:
         thread_id: int | None = None,
         purpose: str | None = None,
     ) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO executions(
-                chat_id, message_id, version, thread_id, action_type, purpose, symbol, side, status, reason, intent_json, created_at
+        with self._write_lock:
+            created = datetime.now(timezone.utc)
+            created_at = created.isoformat()
+            cur = self.conn.execute(
+                """
+                INSERT INTO executions(
+                    chat_id, message_id, version, thread_id, action_type, purpose, symbol, side, status, reason, intent_json,
+                    created_at, created_at_ms
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    chat_id,
+                    message_id,
+                    version,
+                    thread_id,
+                    action_type,
+                    purpose,
+                    symbol,
+                    side,
+                    status,
+                    reason,
+                    _dumps(intent) if intent is not None else None,
+                    created_at,
+                    int(created.timestamp() * 1000),
+                ),
             )
-            VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                chat_id,
-                message_id,
-                version,
-                thread_id,
-                action_type,
-                purpose,
-                symbol,
-                side,
-                status,
-                reason,
-                json.dumps(intent, ensure_ascii=False, default=str) if intent is not None else None,
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
-        return int(cur.lastrowid)
+            self._commit()
+            return int(cur.lastrowid)
 
     def has_message_processing_records(self, chat_id: int, message_id: int, version: int) -> bool:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT 1
@@ -562,14 +799,15 @@ class SQLiteStore:
         return cur.fetchone() is not None
 
     def record_order_receipt(self, execution_id: int, exchange_order_id: str | None, payload: Any) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO order_receipts(execution_id, exchange_order_id, payload_json, created_at)
-            VALUES(?,?,?,?)
-            """,
-            (execution_id, exchange_order_id, json.dumps(payload, ensure_ascii=False, default=str), self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT INTO order_receipts(execution_id, exchange_order_id, payload_json, created_at)
+                VALUES(?,?,?,?)
+                """,
+                (execution_id, exchange_order_id, _dumps(payload), self._now_iso()),
+            )
+            self._commit()
 
     def record_event(
         self,
@@ -581,35 +819,36 @@ class SQLiteStore:
         reason: str | None = None,
         thread_id: int | None = None,
     ) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO events(type, level, msg, reason, thread_id, payload_json, trace_id, created_at)
-            VALUES(?,?,?,?,?,?,?,?)
-            """,
-            (
-                event_type,
-                level,
-                msg,
-                reason,
-                thread_id,
-                json.dumps(payload, ensure_ascii=False, default=str) if payload is not None else None,
-                trace_id,
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
-        return int(cur.lastrowid)
+        with self._write_lock:
+            cur = self.conn.execute(
+                """
+                INSERT INTO events(type, level, msg, reason, thread_id, payload_json, trace_id, created_at)
+                VALUES(?,?,?,?,?,?,?,?)
+                """,
+                (
+                    event_type,
+                    level,
+                    msg,
+                    reason,
+                    thread_id,
+                    _dumps(payload) if payload is not None else None,
+                    trace_id,
+                    self._now_iso(),
+                ),
+            )
+            self._commit()
+            return int(cur.lastrowid)
 
     def snapshot_equity(self, equity: float, available: float | None, margin_used: float | None) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO equity_snapshots(equity, available, margin_used, created_at)
-            VALUES(?,?,?,?)
-            """,
-            (equity, available, margin_used, self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT INTO equity_snapshots(equity, available, margin_used, created_at)
+                VALUES(?,?,?,?)
+                """,
+                (equity, available, margin_used, self._now_iso()),
+            )
+            self._commit()
 
     def record_invariant_violation(
         self,
@@ -619,23 +858,23 @@ class SQLiteStore:
         payload: dict[str, Any] | None = None,
         trace_id: str | None = None,
     ) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO invariants_violations(invariant_name, symbol, reason, payload_json, trace_id, created_at)
-            VALUES(?,?,?,?,?,?)
-            """,
-            (
-                invariant_name,
-                symbol,
-                reason,
-                json.dumps(payload, ensure_ascii=False, default=str) if payload is not None else None,
-                trace_id,
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
-        return int(cur.lastrowid)
+        with self._write_lock:
+            cur = self.conn.execute(
+                """
+                INSERT INTO invariants_violations(invariant_name, symbol, reason, payload_json, trace_id, created_at)
+                VALUES(?,?,?,?,?,?)
+                """,
+                (
+                    invariant_name,
+                    symbol,
+                    reason,
+                    _dumps(payload) if payload is not None else None,
+                    trace_id,
+                    self._now_iso(),
+                ),
+            )
+            self._commit()
+            return int(cur.lastrowid)
 
     def record_reconciler_action(
         self,
@@ -649,52 +888,54 @@ class SQLiteStore:
         thread_id: int | None = None,
         purpose: str | None = None,
     ) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO reconciler_actions(
-                thread_id, symbol, order_id, client_order_id, action, purpose, reason, payload_json, trace_id, created_at
+        with self._write_lock:
+            cur = self.conn.execute(
+                """
+                INSERT INTO reconciler_actions(
+                    thread_id, symbol, order_id, client_order_id, action, purpose, reason, payload_json, trace_id, created_at
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    thread_id,
+                    symbol,
+                    order_id,
+                    client_order_id,
+                    action,
+                    purpose,
+                    reason,
+                    _dumps(payload) if payload is not None else None,
+                    trace_id,
+                    self._now_iso(),
+                ),
             )
-            VALUES(?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                thread_id,
-                symbol,
-                order_id,
-                client_order_id,
-                action,
-                purpose,
-                reason,
-                json.dumps(payload, ensure_ascii=False, default=str) if payload is not None else None,
-                trace_id,
-                self._now_iso(),
-            ),
-        )
-        self.conn.commit()
-        return int(cur.lastrowid)
+            self._commit()
+            return int(cur.lastrowid)
 
     def save_runtime_snapshot(self, state_payload: dict[str, Any]) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO runtime_state_snapshots(state_json, created_at)
-            VALUES(?,?)
-            """,
-            (json.dumps(state_payload, ensure_ascii=False, default=str), self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT INTO runtime_state_snapshots(state_json, created_at)
+                VALUES(?,?)
+                """,
+                (_dumps(state_payload), self._now_iso()),
+            )
+            self._commit()
 
     def set_system_flag(self, key: str, value: str | None) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO system_flags(key, value, updated_at) VALUES(?,?,?)
-            ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at
-            """,
-            (key, value, self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT INTO system_flags(key, value, updated_at) VALUES(?,?,?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at
+                """,
+                (key, value, self._now_iso()),
+            )
+            self._commit()
 
     def get_system_flag(self, key: str) -> str | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute("SELECT value FROM system_flags WHERE key=? LIMIT 1", (key,))
         row = cur.fetchone()
         if row is None:
@@ -702,7 +943,7 @@ class SQLiteStore:
         return str(row["value"]) if row["value"] is not None else None
 
     def get_recent_equity_max(self) -> float | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute("SELECT MAX(equity) AS max_equity FROM equity_snapshots")
         row = cur.fetchone()
         if row is None or row["max_equity"] is None:
@@ -710,7 +951,7 @@ class SQLiteStore:
         return float(row["max_equity"])
 
     def get_media_by_sha256(self, sha256: str) -> dict[str, Any] | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT sha256, source_url, local_path, mime_type, size_bytes, created_at
@@ -740,14 +981,15 @@ class SQLiteStore:
         mime_type: str | None,
         size_bytes: int,
     ) -> None:
-        self.conn.execute(
-            """
-            INSERT OR IGNORE INTO media_assets(sha256, source_url, local_path, mime_type, size_bytes, created_at)
-            VALUES(?,?,?,?,?,?)
-            """,
-            (sha256, source_url, local_path, mime_type, size_bytes, self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT OR IGNORE INTO media_assets(sha256, source_url, local_path, mime_type, size_bytes, created_at)
+                VALUES(?,?,?,?,?,?)
+                """,
+                (sha256, source_url, local_path, mime_type, size_bytes, self._now_iso()),
+            )
+            self._commit()
 
     def link_message_media(
         self,
@@ -757,20 +999,21 @@ class SQLiteStore:
         sha256: str,
         source_url: str | None,
     ) -> None:
-        self.conn.execute(
-            """
-            INSERT OR IGNORE INTO message_media(chat_id, message_id, version, sha256, source_url, created_at)
-            VALUES(?,?,?,?,?,?)
-            """,
-            (chat_id, message_id, version, sha256, source_url, self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT OR IGNORE INTO message_media(chat_id, message_id, version, sha256, source_url, created_at)
+                VALUES(?,?,?,?,?,?)
+                """,
+                (chat_id, message_id, version, sha256, source_url, self._now_iso()),
+            )
+            self._commit()
 
     def within_cooldown(self, symbol: str, side: str, cooldown_seconds: int, now: datetime) -> bool:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
-            SELECT created_at
+            SELECT created_at_ms, created_at
             FROM executions
             WHERE symbol=? AND side=? AND status IN ('EXECUTED', 'DRY_RUN')
             ORDER BY id DESC
@@ -782,13 +1025,23 @@ class SQLiteStore:
         if row is None:
             return False
 
-        last_at = datetime.fromisoformat(row["created_at"])
-        if last_at.tzinfo is None:
-            last_at = last_at.replace(tzinfo=timezone.utc)
-        return (now - last_at).total_seconds() < cooldown_seconds
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        created_at_ms = row["created_at_ms"]
+        if created_at_ms is None:
+            # Rows the migration backfill could not parse, or written by an older
+            # binary that does not fill created_at_ms.
+            try:
+                last_at = datetime.fromisoformat(row["created_at"])
+            except (TypeError, ValueError):
+                return False
+            if last_at.tzinfo is None:
+                last_at = last_at.replace(tzinfo=timezone.utc)
+            return (now - last_at).total_seconds() < cooldown_seconds
+        return now.timestamp() * 1000 - int(created_at_ms) < cooldown_seconds * 1000
 
     def get_last_entry_symbol(self, chat_id: int) -> str | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT symbol
@@ -816,45 +1069,46 @@ class SQLiteStore:
         status: str = "ACTIVE",
         target_version: int = 1,
     ) -> None:
-        now = self._now_iso()
-        self.conn.execute(
-            """
-            INSERT INTO trade_threads(
-                thread_id, symbol, side, leverage, stop_loss, entry_points_json, tp_points_json, filled_tp_points_json,
-                target_version, created_at, updated_at, status
+        with self._write_lock:
+            now = self._now_iso()
+            self.conn.execute(
+                """
+                INSERT INTO trade_threads(
+                    thread_id, symbol, side, leverage, stop_loss, entry_points_json, tp_points_json, filled_tp_points_json,
+                    target_version, created_at, updated_at, status
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+                ON CONFLICT(thread_id) DO UPDATE SET
+                    symbol=COALESCE(excluded.symbol, trade_threads.symbol),
+                    side=COALESCE(excluded.side, trade_threads.side),
+                    leverage=COALESCE(excluded.leverage, trade_threads.leverage),
+                    stop_loss=COALESCE(excluded.stop_loss, trade_threads.stop_loss),
+                    entry_points_json=COALESCE(excluded.entry_points_json, trade_threads.entry_points_json),
+                    tp_points_json=COALESCE(excluded.tp_points_json, trade_threads.tp_points_json),
+                    filled_tp_points_json=COALESCE(excluded.filled_tp_points_json, trade_threads.filled_tp_points_json),
+                    target_version=MAX(excluded.target_version, trade_threads.target_version),
+                    updated_at=excluded.updated_at,
+                    status=excluded.status
+                """,
+                (
+                    thread_id,
+                    symbol,
+                    side,
+                    leverage,
+                    stop_loss,
+                    _dumps(entry_points) if entry_points is not None else None,
+                    _dumps(tp_points) if tp_points is not None else None,
+                    _dumps(filled_tp_points) if filled_tp_points is not None else None,
+                    int(target_version),
+                    now,
+                    now,
+                    status,
+                ),
             )
-            VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
-            ON CONFLICT(thread_id) DO UPDATE SET
-                symbol=COALESCE(excluded.symbol, trade_threads.symbol),
-                side=COALESCE(excluded.side, trade_threads.side),
-                leverage=COALESCE(excluded.leverage, trade_threads.leverage),
-                stop_loss=COALESCE(excluded.stop_loss, trade_threads.stop_loss),
-                entry_points_json=COALESCE(excluded.entry_points_json, trade_threads.entry_points_json),
-                tp_points_json=COALESCE(excluded.tp_points_json, trade_threads.tp_points_json),
-                filled_tp_points_json=COALESCE(excluded.filled_tp_points_json, trade_threads.filled_tp_points_json),
-                target_version=MAX(excluded.target_version, trade_threads.target_version),
-                updated_at=excluded.updated_at,
-                status=excluded.status
-            """,
-            (
-                thread_id,
-                symbol,
-                side,
-                leverage,
-                stop_loss,
-                json.dumps(entry_points, ensure_ascii=False, default=str) if entry_points is not None else None,
-                json.dumps(tp_points, ensure_ascii=False, default=str) if tp_points is not None else None,
-                json.dumps(filled_tp_points, ensure_ascii=False, default=str) if filled_tp_points is not None else None,
-                int(target_version),
-                now,
-                now,
-                status,
-            ),
-        )
-        self.conn.commit()
+            self._commit()
 
     def get_trade_thread(self, thread_id: int) -> dict[str, Any] | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT
@@ -875,9 +1129,9 @@ class SQLiteStore:
             "side": row["side"],
             "leverage": row["leverage"],
             "stop_loss": row["stop_loss"],
-            "entry_points": json.loads(row["entry_points_json"]) if row["entry_points_json"] else [],
-            "tp_points": json.loads(row["tp_points_json"]) if row["tp_points_json"] else [],
-            "filled_tp_points": json.loads(row["filled_tp_points_json"]) if row["filled_tp_points_json"] else [],
+            "entry_points": _loads(row["entry_points_json"]) if row["entry_points_json"] else [],
+            "tp_points": _loads(row["tp_points_json"]) if row["tp_points_json"] else [],
+            "filled_tp_points": _loads(row["filled_tp_points_json"]) if row["filled_tp_points_json"] else [],
             "target_version": int(row["target_version"]),
             "created_at": row["created_at"],
             "updated_at": row["updated_at"],
@@ -893,44 +1147,46 @@ class SQLiteStore:
         return [tp for tp in tp_points if not any(self._tp_matches(tp, filled) for filled in filled_tp_points)]
 
     def mark_tp_point_filled(self, *, thread_id: int, tp_price: float | None) -> list[float]:
-        if tp_price in {None, ""}:
-            return self.get_remaining_tp_points(thread_id)
-        thread = self.get_trade_thread(thread_id)
-        if thread is None:
-            return []
-
-        filled_tp_points = [float(v) for v in thread.get("filled_tp_points", []) if float(v) > 0]
-        target_price = float(tp_price)
-        canonical_price = target_price
-        for candidate in thread.get("tp_points", []):
-            candidate_price = float(candidate)
-            if self._tp_matches(candidate_price, target_price):
-                canonical_price = candidate_price
-                break
-        if any(self._tp_matches(existing, canonical_price) for existing in filled_tp_points):
+        with self._write_lock:
+            if tp_price in {None, ""}:
+                return self.get_remaining_tp_points(thread_id)
+            thread = self.get_trade_thread(thread_id)
+            if thread is None:
+                return []
+
+            filled_tp_points = [float(v) for v in thread.get("filled_tp_points", []) if float(v) > 0]
+            target_price = float(tp_price)
+            canonical_price = target_price
+            for candidate in thread.get("tp_points", []):
+                candidate_price = float(candidate)
+                if self._tp_matches(candidate_price, target_price):
+                    canonical_price = candidate_price
+                    break
+            if any(self._tp_matches(existing, canonical_price) for existing in filled_tp_points):
+                return self.get_remaining_tp_points(thread_id)
+
+            filled_tp_points.append(canonical_price)
+            self.conn.execute(
+                "UPDATE trade_threads SET filled_tp_points_json=?, updated_at=? WHERE thread_id=?",
+                (
+                    _dumps(filled_tp_points),
+                    self._now_iso(),
+                    thread_id,
+                ),
+            )
+            self._commit()
             return self.get_remaining_tp_points(thread_id)
 
-        filled_tp_points.append(canonical_price)
-        self.conn.execute(
-            "UPDATE trade_threads SET filled_tp_points_json=?, updated_at=? WHERE thread_id=?",
-            (
-                json.dumps(filled_tp_points, ensure_ascii=False, default=str),
-                self._now_iso(),
-                thread_id,
-            ),
-        )
-        self.conn.commit()
-        return self.get_remaining_tp_points(thread_id)
-
     def set_trade_thread_status(self, thread_id: int, status: str) -> None:
-        self.conn.execute(
-            "UPDATE trade_threads SET status=?, updated_at=? WHERE thread_id=?",
-            (status, self._now_iso(), thread_id),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                "UPDATE trade_threads SET status=?, updated_at=? WHERE thread_id=?",
+                (status, self._now_iso(), thread_id),
+            )
+            self._commit()
 
     def find_latest_thread_id_by_symbol(self, symbol: str) -> int | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT thread_id
@@ -947,7 +1203,7 @@ class SQLiteStore:
         return int(row["thread_id"])
 
     def get_latest_trade_thread_by_symbol(self, symbol: str, *, active_only: bool = False) -> dict[str, Any] | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         where = "WHERE symbol=?"
         params: list[Any] = [symbol.upper()]
         if active_only:
@@ -980,7 +1236,7 @@ class SQLiteStore:
         statuses: tuple[str, ...] = ("EXECUTED", "DRY_RUN"),
     ) -> int:
         placeholders = ",".join(["?"] * len(statuses))
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             f"""
             SELECT COUNT(*) AS c
@@ -993,33 +1249,34 @@ class SQLiteStore:
         return int(row["c"]) if row else 0
 
     def bump_trade_thread_version(self, thread_id: int) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT target_version FROM trade_threads WHERE thread_id=? LIMIT 1",
-            (thread_id,),
-        )
-        row = cur.fetchone()
-        if row is None:
-            version = 1
-            self.upsert_trade_thread(
-                thread_id=thread_id,
-                symbol=None,
-                side=None,
-                leverage=None,
-                status="ACTIVE",
-                target_version=version,
+        with self._write_lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                "SELECT target_version FROM trade_threads WHERE thread_id=? LIMIT 1",
+                (thread_id,),
+            )
+            row = cur.fetchone()
+            if row is None:
+                version = 1
+                self.upsert_trade_thread(
+                    thread_id=thread_id,
+                    symbol=None,
+                    side=None,
+                    leverage=None,
+                    status="ACTIVE",
+                    target_version=version,
+                )
+                return version
+            version = int(row["target_version"]) + 1
+            self.conn.execute(
+                "UPDATE trade_threads SET target_version=?, updated_at=? WHERE thread_id=?",
+                (version, self._now_iso(), thread_id),
             )
+            self._commit()
             return version
-        version = int(row["target_version"]) + 1
-        self.conn.execute(
-            "UPDATE trade_threads SET target_version=?, updated_at=? WHERE thread_id=?",
-            (version, self._now_iso(), thread_id),
-        )
-        self.conn.commit()
-        return version
 
     def count_active_trade_threads(self) -> int:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT COUNT(*) AS c
@@ -1039,17 +1296,18 @@ class SQLiteStore:
         is_root: bool,
         kind: str,
     ) -> None:
-        self.conn.execute(
-            """
-            INSERT OR IGNORE INTO thread_messages(thread_id, chat_id, message_id, is_root, kind, created_at)
-            VALUES(?,?,?,?,?,?)
-            """,
-            (thread_id, chat_id, message_id, 1 if is_root else 0, kind, self._now_iso()),
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self.conn.execute(
+                """
+                INSERT OR IGNORE INTO thread_messages(thread_id, chat_id, message_id, is_root, kind, created_at)
+                VALUES(?,?,?,?,?,?)
+                """,
+                (thread_id, chat_id, message_id, 1 if is_root else 0, kind, self._now_iso()),
+            )
+            self._commit()
 
     def resolve_thread_root_by_message(self, *, chat_id: int, message_id: int) -> int | None:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute(
             """
             SELECT thread_id
@@ -1101,13 +1359,91 @@ class SQLiteStore:
                 return thread_id
 
         # Backward compatibility for historical single-channel thread_id=message_id mapping.
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         cur.execute("SELECT thread_id FROM trade_threads WHERE thread_id=? LIMIT 1", (reply_to_msg_id,))
         row = cur.fetchone()
         return int(row["thread_id"]) if row is not None else None
 
+    @contextmanager
+    def deferred_commits(self) -> Iterator[None]:
+        """Commit writes made on this thread once, when the outermost block exits.
+
+        Rows are inserted immediately (ids and same-connection reads still work);
+        only the per-write commit/fsync is coalesced for bursty paths. Writes
+        from other threads wait on the writer lock until the block exits. If an
+        exception escapes the outermost block, its writes are rolled back, so a
+        transaction() nested inside stays all-or-nothing.
+        """
+        with self._write_lock:
+            depth = getattr(self._deferred, "depth", 0)
+            self._deferred.depth = depth + 1
+            try:
+                yield
+            except BaseException:
+                self._deferred.depth = depth
+                if depth == 0:
+                    self.conn.rollback()
+                raise
+            self._deferred.depth = depth
+            if depth == 0:
+                self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Like deferred_commits(), but all-or-nothing: the outermost block rolls
+        back every write made inside it if it raises. Holds the writer lock, so
+        no other thread can commit part of the block."""
+        with self._write_lock:
+            depth = getattr(self._deferred, "depth", 0)
+            if depth == 0 and not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._deferred.depth = depth + 1
+            try:
+                yield
+            except BaseException:
+                self._deferred.depth = depth
+                if depth == 0:
+                    self.conn.rollback()
+                raise
+            self._deferred.depth = depth
+            if depth == 0:
+                self.conn.commit()
+
+    def _reader(self) -> sqlite3.Connection:
+        # Inside deferred_commits()/transaction() this thread must see its own
+        # uncommitted rows, which only the writer connection has.
+        if not self._use_readers or getattr(self._deferred, "depth", 0):
+            return self.conn
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = _connect(self._path)
+            conn.execute("PRAGMA query_only=ON")
+            self._readers.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def _commit(self) -> None:
+        with self._write_lock:
+            if getattr(self._deferred, "depth", 0):
+                return
+            self.conn.commit()
+            self._commits_since_optimize += 1
+            if self._commits_since_optimize >= _OPTIMIZE_EVERY_COMMITS:
+                self._commits_since_optimize = 0
+                self.conn.execute("PRAGMA optimize")
+
     def close(self) -> None:
-        self.conn.close()
+        with self._reader_conns_lock:
+            readers, self._reader_conns = self._reader_conns, []
+        for conn in readers:
+            conn.close()
+        with self._write_lock:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # best effort; never block shutdown on planner stats
+            self.conn.close()
 
     @staticmethod
     def _chat_id_variants(chat_id: int) -> set[int]:
@@ -1123,16 +1459,33 @@ class SQLiteStore:
         return variants
 
     @staticmethod
-    def _json(payload: Any) -> dict[str, Any]:
+    def _signal_fields(parsed: ParsedMessage | dict[str, Any]) -> tuple[Any, Any, Any]:
+        """(signal_type, symbol, side) read straight off the message, without asdict()."""
+        if isinstance(parsed, dict):
+            kind = parsed.get("kind", "UNKNOWN")
+            symbol = parsed.get("symbol")
+            side = parsed.get("side")
+            if isinstance(side, dict) and "value" in side:
+                side = side["value"]
+        else:
+            kind = parsed.kind
+            symbol = getattr(parsed, "symbol", None)
+            side = getattr(parsed, "side", None)
+        return getattr(kind, "value", kind), symbol, getattr(side, "value", side)
+
+    @staticmethod
+    def _json(payload: Any) -> Any:
         if is_dataclass(payload):
-            return asdict(payload)
+            # orjson encodes dataclasses natively (same document as asdict());
+            # only the stdlib fallback needs the recursive dict copy.
+            return payload if orjson is not None else asdict(payload)
         if isinstance(payload, dict):
             return payload
         raise TypeError(f"cannot serialize payload type: {type(payload)}")
 
     @staticmethod
     def _now_iso() -> str:
-        return datetime.now(timezone.utc).isoformat()
+        return datetime.now(_UTC).isoformat()
 
     @staticmethod
     def _iso(dt: datetime | None) -> str | None:
@@ -7,8 +7,13 @@ from typing import Any
 
 from trader.bitget_client import BitgetClient
 
+_SIZE_PLACE_KEYS = ("sizePlace", "volumePlace", "qtyPlace")
+_PRICE_PLACE_KEYS = ("pricePlace",)
+_MIN_TRADE_KEYS = ("minTradeNum", "minTradeUSDT", "minTradeAmount")
+_VOLUME_KEYS = ("usdtVolume", "quoteVolume", "quoteVol", "turnover24h", "baseVolume")
 
-@dataclass
+
+@dataclass(slots=True)
 class ContractInfo:
     symbol: str
     size_place: int
@@ -30,6 +35,7 @@ class SymbolRegistry:
         self._contracts: dict[str, ContractInfo] = {}
         self._volumes: dict[str, float] = {}
         self._last_refresh: datetime | None = None
+        self._last_logged_counts: tuple[int, int] | None = None
 
     def refresh(self, force: bool = False) -> None:
         if not force and self._last_refresh is not None:
@@ -43,9 +49,9 @@ class SymbolRegistry:
             if not symbol:
                 continue
 
-            size_place = self._int_from(item, ["sizePlace", "volumePlace", "qtyPlace"], default=3)
-            price_place = self._int_from(item, ["pricePlace"], default=6)
-            min_trade_num = self._float_from(item, ["minTradeNum", "minTradeUSDT", "minTradeAmount"], default=0.0)
+            size_place = self._int_from(item, _SIZE_PLACE_KEYS, default=3)
+            price_place = self._int_from(item, _PRICE_PLACE_KEYS, default=6)
+            min_trade_num = self._float_from(item, _MIN_TRADE_KEYS, default=0.0)
 
             parsed_contracts[symbol] = ContractInfo(
                 symbol=symbol,
@@ -58,7 +64,10 @@ class SymbolRegistry:
         self._contracts = parsed_contracts
         self._refresh_volumes()
         self._last_refresh = datetime.now(timezone.utc)
-        self.logger.info("SymbolRegistry refreshed: contracts=%s volumes=%s", len(self._contracts), len(self._volumes))
+        counts = (len(self._contracts), len(self._volumes))
+        if counts != self._last_logged_counts:
+            self._last_logged_counts = counts
+            self.logger.info("SymbolRegistry refreshed: contracts=%s volumes=%s", *counts)
 
     def _refresh_volumes(self) -> None:
         try:
@@ -74,17 +83,7 @@ class SymbolRegistry:
             if not symbol:
                 continue
 
-            value = self._float_from(
-                item,
-                [
-                    "usdtVolume",
-                    "quoteVolume",
-                    "quoteVol",
-                    "turnover24h",
-                    "baseVolume",
-                ],
-                default=None,
-            )
+            value = self._float_from(item, _VOLUME_KEYS, default=None)
             if value is not None:
                 volumes[symbol] = value
         self._volumes = volumes
@@ -99,21 +98,27 @@ class SymbolRegistry:
         return self._volumes.get(symbol.upper())
 
     @staticmethod
-    def _int_from(payload: dict[str, Any], keys: list[str], default: int) -> int:
+    def _int_from(payload: dict[str, Any], keys: tuple[str, ...], default: int) -> int:
         for key in keys:
-            if key in payload and payload[key] not in (None, ""):
-                try:
-                    return int(float(payload[key]))
-                except (TypeError, ValueError):
-                    continue
+            value = payload.get(key)
+            if value is None or value == "":
+                continue
+            if type(value) is int:
+                return value
+            try:
+                return int(float(value))
+            except (TypeError, ValueError):
+                continue
         return default
 
     @staticmethod
-    def _float_from(payload: dict[str, Any], keys: list[str], default: float | None) -> float | None:
+    def _float_from(payload: dict[str, Any], keys: tuple[str, ...], default: float | None) -> float | None:
         for key in keys:
-            if key in payload and payload[key] not in (None, ""):
-                try:
-                    return float(payload[key])
-                except (TypeError, ValueError):
-                    continue
+            value = payload.get(key)
+            if value is None or value == "":
+                continue
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
         return default
@@ -10,10 +10,15 @@ from trader.config import TelegramConfig
 from trader.models import TelegramEvent
 
 
+# First attribute present wins: photos and stickers are also "media".
+_MEDIA_TYPES = (("photo", "photo"), ("sticker", "sticker"), ("media", "document"))
+
+
 class TelegramListener:
     def __init__(self, config: TelegramConfig, logger: logging.Logger) -> None:
         self.config = config
         self.logger = logger
+        self._channel_match = self._parse_channel(config.channel)
 
     async def run(self, on_event: Callable[[TelegramEvent], Awaitable[None]]) -> None:
         if self.config.api_id is None or self.config.api_hash is None:
@@ -34,21 +39,21 @@ class TelegramListener:
 
     async def _dispatch(self, event, on_event: Callable[[TelegramEvent], Awaitable[None]], is_edit: bool) -> None:
         try:
-            chat = await event.get_chat()
-            if not self._match_channel(chat, event):
+            if not await self._match_channel(event):
                 return
 
-            event_time = event.message.date if event.message and event.message.date else datetime.now(timezone.utc)
+            message = event.message
+            event_time = message.date if message and message.date else datetime.now(timezone.utc)
             reply_to_msg_id = None
-            if event.message and getattr(event.message, "reply_to", None) is not None:
-                reply_to_msg_id = getattr(event.message.reply_to, "reply_to_msg_id", None)
             media_type = "none"
-            if event.message and getattr(event.message, "photo", None) is not None:
-                media_type = "photo"
-            elif event.message and getattr(event.message, "sticker", None) is not None:
-                media_type = "sticker"
-            elif event.message and getattr(event.message, "media", None) is not None:
-                media_type = "document"
+            if message is not None:
+                reply_to = getattr(message, "reply_to", None)
+                if reply_to is not None:
+                    reply_to_msg_id = getattr(reply_to, "reply_to_msg_id", None)
+                for attr, kind in _MEDIA_TYPES:
+                    if getattr(message, attr, None) is not None:
+                        media_type = kind
+                        break
             wrapped = TelegramEvent(
                 chat_id=int(event.chat_id or 0),
                 message_id=int(event.id),
@@ -63,19 +68,27 @@ class TelegramListener:
         except Exception:  # noqa: BLE001
             self.logger.exception("Telegram handler error (is_edit=%s)", is_edit)
 
-    def _match_channel(self, chat, event) -> bool:
-        channel = self.config.channel.strip()
+    @staticmethod
+    def _parse_channel(channel: str) -> tuple[str, str | int] | None:
+        channel = channel.strip()
         if not channel:
-            return True
-
+            return None
         if channel.startswith("@"):
-            target = channel[1:].lower()
-            username = str(getattr(chat, "username", "") or "").lower()
-            return username == target
-
+            return "username", channel[1:].lower()
         # Support numeric channel id in config, e.g. -1001234567890
         if channel.lstrip("-").isdigit():
-            return int(channel) == int(event.chat_id or 0)
+            return "id", int(channel)
+        return "title", channel.lower()
+
+    async def _match_channel(self, event) -> bool:
+        if self._channel_match is None:
+            return True
+        kind, target = self._channel_match
+        if kind == "id":
+            # Numeric ids match on the event alone, no chat entity fetch.
+            return target == int(event.chat_id or 0)
 
-        title = str(getattr(chat, "title", "") or "").lower()
-        return channel.lower() == title
+        chat = await event.get_chat()
+        if kind == "username":
+            return str(getattr(chat, "username", "") or "").lower() == target
+        return str(getattr(chat, "title", "") or "").lower() == target
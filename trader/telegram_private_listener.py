@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
@@ -29,6 +30,9 @@ class TelegramPrivateListener:
         self._forward_source_ids: set[int] = set()
         self._replay_days_cap_logged = False
         self._control_usernames = self._normalize_usernames(control_usernames or [])
+        # One FIFO + worker per chat: ordering holds within a chat, chats don't block each other.
+        self._queues: dict[int, asyncio.Queue[tuple[Any, bool]]] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
 
     async def run(
         self,
@@ -64,18 +68,66 @@ class TelegramPrivateListener:
 
         @client.on(events.NewMessage(chats=chats))
         async def on_new_message(event: events.NewMessage.Event) -> None:
-            await self._dispatch(event, on_event=on_event, on_ignored=on_ignored, is_edit=False)
+            self._enqueue(event, on_event=on_event, on_ignored=on_ignored, is_edit=False)
 
         if self.config.enable_edited_events:
             @client.on(events.MessageEdited(chats=chats))
             async def on_edited_message(event: events.MessageEdited.Event) -> None:
-                await self._dispatch(event, on_event=on_event, on_ignored=on_ignored, is_edit=True)
+                self._enqueue(event, on_event=on_event, on_ignored=on_ignored, is_edit=True)
 
         if self.config.startup_replay_days > 0:
             await self._replay_recent_messages(client, on_event=on_event, on_ignored=on_ignored)
 
         await client.run_until_disconnected()
 
+    async def close(self, drain_timeout: float | None = None) -> None:
+        """Stop the per-chat workers, optionally letting queued events finish first."""
+        if drain_timeout is not None and self._queues:
+            joins = asyncio.gather(*(queue.join() for queue in self._queues.values()))
+            try:
+                await asyncio.wait_for(joins, timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    "Telegram private queues not drained within %.1fs; dropping %d pending event(s)",
+                    drain_timeout,
+                    sum(queue.qsize() for queue in self._queues.values()),
+                )
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    def _enqueue(
+        self,
+        event,
+        on_event: Callable[[TelegramEvent], Awaitable[bool]],
+        on_ignored: Callable[[dict[str, Any]], Awaitable[None]] | None,
+        is_edit: bool,
+    ) -> None:
+        chat_id = int(event.chat_id or self._primary_channel_id() or 0)
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+            self._workers[chat_id] = asyncio.create_task(
+                self._chat_worker(queue, on_event=on_event, on_ignored=on_ignored)
+            )
+        queue.put_nowait((event, is_edit))
+
+    async def _chat_worker(
+        self,
+        queue: asyncio.Queue[tuple[Any, bool]],
+        on_event: Callable[[TelegramEvent], Awaitable[bool]],
+        on_ignored: Callable[[dict[str, Any]], Awaitable[None]] | None,
+    ) -> None:
+        while True:
+            event, is_edit = await queue.get()
+            try:
+                await self._dispatch(event, on_event=on_event, on_ignored=on_ignored, is_edit=is_edit)
+            finally:
+                queue.task_done()
+
     async def _dispatch(
         self,
         event,
@@ -132,9 +184,10 @@ class TelegramPrivateListener:
 
         reply_to_msg_id: int | None = None
         reply_to_chat_id: int | None = None
-        if getattr(message, "reply_to", None) is not None:
-            reply_to_msg_id = getattr(message.reply_to, "reply_to_msg_id", None)
-            reply_to_chat_id = self._reply_peer_to_chat_id(getattr(message.reply_to, "reply_to_peer_id", None))
+        reply_to = getattr(message, "reply_to", None)
+        if reply_to is not None:
+            reply_to_msg_id = getattr(reply_to, "reply_to_msg_id", None)
+            reply_to_chat_id = self._reply_peer_to_chat_id(getattr(reply_to, "reply_to_peer_id", None))
 
         media_type, media_path = await self._extract_media(message)
         sender_id = getattr(message, "sender_id", None)
@@ -440,7 +493,8 @@ class TelegramPrivateListener:
         if getattr(message, "photo", None) is not None:
             media_type = "photo"
         elif getattr(message, "sticker", None) is not None:
-            media_type = "sticker"
+            # Stickers carry no signal content; don't download them for the VLM.
+            return "sticker", None
 
         day_dir = self.media_dir / datetime.now(timezone.utc).strftime("%Y%m%d")
         day_dir.mkdir(parents=True, exist_ok=True)
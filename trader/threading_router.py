@@ -14,7 +14,7 @@ TP_HINT_RE = re.compile(r"(?:盈利位|止盈位|盈利|止盈)", re.IGNORECASE)
 SL_HINT_RE = re.compile(r"(?:止損位|止损位|止損|止损|SL)", re.IGNORECASE)
 
 
-@dataclass
+@dataclass(slots=True)
 class ThreadResolveResult:
     thread_id: int | None
     is_root: bool
@@ -34,19 +34,22 @@ class TradeThreadRouter:
         reply_to_msg_id: int | None,
         reply_to_chat_id: int | None = None,
     ) -> ThreadResolveResult:
-        normalized = self._normalize(text)
-        if TRADE_SIGNAL_KEYWORD_RE.search(normalized):
-            return ThreadResolveResult(
-                thread_id=self.compose_thread_id(chat_id=chat_id, message_id=message_id),
-                is_root=True,
-                reason="root_keyword_detected",
-            )
-        if self._looks_like_standalone_entry_signal(normalized):
-            return ThreadResolveResult(
-                thread_id=self.compose_thread_id(chat_id=chat_id, message_id=message_id),
-                is_root=True,
-                reason="root_structure_detected",
-            )
+        # Both root markers (the banner and the entry hint) are CJK, and NFKC
+        # leaves ASCII unchanged, so pure-ASCII text can only be a reply.
+        if text and not text.isascii():
+            normalized = self._normalize(text)
+            if TRADE_SIGNAL_KEYWORD_RE.search(normalized):
+                return ThreadResolveResult(
+                    thread_id=self.compose_thread_id(chat_id=chat_id, message_id=message_id),
+                    is_root=True,
+                    reason="root_keyword_detected",
+                )
+            if self._looks_like_standalone_entry_signal(normalized):
+                return ThreadResolveResult(
+                    thread_id=self.compose_thread_id(chat_id=chat_id, message_id=message_id),
+                    is_root=True,
+                    reason="root_structure_detected",
+                )
 
         thread_id = self.store.resolve_thread_root_by_reply(
             chat_id=chat_id,
@@ -10,7 +10,7 @@ from trader.rate_limiter import exponential_backoff_seconds
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryPolicy:
     timeout_seconds: float = 10.0
     max_retries: int = 2
@@ -40,7 +40,9 @@ async def run_async_with_retries(func: Callable[[], Any], policy: RetryPolicy) -
     last_error: Exception | None = None
     for attempt in range(policy.max_retries + 1):
         try:
-            return await asyncio.wait_for(func(), timeout=policy.timeout_seconds)
+            # asyncio.timeout arms one timer on the current task; wait_for wraps each attempt in a new Task.
+            async with asyncio.timeout(policy.timeout_seconds):
+                return await func()
         except Exception as exc:  # noqa: BLE001
             last_error = exc
             if attempt >= policy.max_retries:
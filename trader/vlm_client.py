@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import base64
+import binascii
 import json
 import os
 import time
@@ -11,6 +11,11 @@ import requests
 from trader.config import VLMConfig
 from trader.vlm_schema import VLMParsedSignal, get_vlm_json_schema
 
+try:
+    import orjson
+except ImportError:  # optional speedup; request bodies hold no datetimes or NaN, so both encoders agree
+    orjson = None  # type: ignore[assignment]
+
 _SYSTEM_PROMPT = """You are a strict trading-signal extractor.
 Return JSON only, no prose.
 Do extraction only. Never make trading decisions.
@@ -31,6 +36,10 @@ Hard constraints:
 9) For explicit full-close intent (e.g. 全平/close all), set manage.reduce_pct=100 and add_pct=null.
 """
 _VLM_SCHEMA_JSON_TEXT = json.dumps(get_vlm_json_schema(), ensure_ascii=False)
+_SCHEMA_HINT = f"Follow JSON schema exactly (no extra keys):\n{_VLM_SCHEMA_JSON_TEXT}\n"
+_SCHEMA_RETRY_HINT = "Previous output violated schema. Fix it and return strictly valid JSON.\n" + _SCHEMA_HINT
+# Shared by every request; payloads are only serialized, never mutated.
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
 
 
 class VLMClient:
@@ -50,10 +59,12 @@ class VLMClient:
         )
 
     def extract(self, image_bytes: bytes | None, text_context: str) -> VLMParsedSignal:
+        # Encode the image once; the schema retry resends the same data URL.
+        image_url = _image_data_url(image_bytes) if image_bytes is not None else None
         last_error: Exception | None = None
         for schema_attempt in range(2):
             payload = self._build_payload(
-                image_bytes=image_bytes,
+                image_url=image_url,
                 text_context=text_context,
                 schema_retry=schema_attempt > 0,
             )
@@ -67,30 +78,16 @@ class VLMClient:
                     continue
         raise RuntimeError(f"VLM schema validation failed after one retry: {last_error}")
 
-    def _build_payload(self, image_bytes: bytes | None, text_context: str, schema_retry: bool = False) -> dict[str, Any]:
-        schema_hint = (
-            "Follow JSON schema exactly (no extra keys):\n"
-            f"{_VLM_SCHEMA_JSON_TEXT}\n"
-        )
-        if schema_retry:
-            schema_hint = (
-                "Previous output violated schema. Fix it and return strictly valid JSON.\n"
-                + schema_hint
-            )
+    def _build_payload(self, image_url: str | None, text_context: str, schema_retry: bool = False) -> dict[str, Any]:
+        schema_hint = _SCHEMA_RETRY_HINT if schema_retry else _SCHEMA_HINT
         content: list[dict[str, Any]] = [{"type": "text", "text": f"{schema_hint}\nContext:\n{text_context or ''}"}]
-        if image_bytes is not None:
-            b64 = base64.b64encode(image_bytes).decode("utf-8")
-            content.append(
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{b64}"},
-                }
-            )
+        if image_url is not None:
+            content.append({"type": "image_url", "image_url": {"url": image_url}})
         return {
             "model": self.config.model,
             "temperature": 0,
             "messages": [
-                {"role": "system", "content": _SYSTEM_PROMPT},
+                _SYSTEM_MESSAGE,
                 {"role": "user", "content": content},
             ],
             "response_format": {"type": "json_object"},
@@ -101,7 +98,7 @@ class VLMClient:
         last_error: Exception | None = None
         for attempt in range(self.config.max_retries + 1):
             try:
-                response = self.session.post(url, data=json.dumps(payload), timeout=self.config.timeout_seconds)
+                response = self.session.post(url, data=_dumps(payload), timeout=self.config.timeout_seconds)
                 response.raise_for_status()
                 return response.json()
             except Exception as exc:  # noqa: BLE001
@@ -128,6 +125,27 @@ class VLMClient:
         return _parse_json_text(raw_text)
 
 
+def _dumps(payload: dict[str, Any]) -> bytes | str:
+    # requests sends bytes as-is; orjson skips the stdlib per-character escape loop.
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload)
+
+
+def _loads(text: str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            pass  # e.g. NaN/Infinity, which only the stdlib decoder accepts
+    return json.loads(text)
+
+
+def _image_data_url(image_bytes: bytes) -> str:
+    # b2a_base64 skips base64.b64encode's wrapper; ASCII decode is a plain copy.
+    return "data:image/jpeg;base64," + binascii.b2a_base64(image_bytes, newline=False).decode("ascii")
+
+
 def _resolve_base_url(provider: str, configured: str | None) -> str:
     if configured:
         return configured.rstrip("/")
@@ -146,7 +164,7 @@ def _parse_json_text(raw: str) -> dict[str, Any]:
     if not text:
         raise RuntimeError("empty JSON text")
     try:
-        return json.loads(text)
+        return _loads(text)
     except Exception:  # noqa: BLE001
         pass
 
@@ -155,10 +173,10 @@ def _parse_json_text(raw: str) -> dict[str, Any]:
         if len(lines) >= 3:
             inner = "\n".join(lines[1:-1]).strip()
             if inner:
-                return json.loads(inner)
+                return _loads(inner)
 
     start = text.find("{")
     end = text.rfind("}")
     if start >= 0 and end > start:
-        return json.loads(text[start : end + 1])
+        return _loads(text[start : end + 1])
     raise RuntimeError(f"invalid JSON text: {text[:200]}")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from functools import cache, lru_cache
 import re
 from typing import Literal
 
@@ -33,6 +34,18 @@ _EXIT_ADDON_HINT_RE = re.compile(
 _DEFAULT_REDUCE_PCT = 35.0
 
 
+# Symbols repeat heavily across responses; invalid ones raise and are not cached.
+@lru_cache(maxsize=512)
+def _normalize_symbol(value: str) -> str:
+    normalized = value.strip().upper().replace("/", "")
+    if not normalized.endswith("USDT"):
+        raise ValueError("symbol quote must be USDT")
+    base = normalized[:-4]
+    if not base or not base.isalnum():
+        raise ValueError("symbol must be <BASE>USDT")
+    return normalized
+
+
 class VLMKind(str, Enum):
     ENTRY_SIGNAL = "ENTRY_SIGNAL"
     MANAGE_ACTION = "MANAGE_ACTION"
@@ -45,6 +58,10 @@ class VLMSide(str, Enum):
     SHORT = "SHORT"
 
 
+_SIDE_MAP = {VLMSide.LONG: Side.LONG, VLMSide.SHORT: Side.SHORT}
+_ENTRY_TYPE_MAP = {"MARKET": EntryType.MARKET, "LIMIT": EntryType.LIMIT}
+
+
 class VLMEntry(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -119,35 +136,29 @@ class VLMParsedSignal(BaseModel):
     def validate_symbol(cls, value: str | None) -> str | None:
         if value is None:
             return None
-        normalized = value.strip().upper().replace("/", "")
-        if not normalized.endswith("USDT"):
-            raise ValueError("symbol quote must be USDT")
-        base = normalized[:-4]
-        if not base or not base.isalnum():
-            raise ValueError("symbol must be <BASE>USDT")
-        return normalized
+        return _normalize_symbol(value)
 
     @model_validator(mode="after")
     def validate_evidence_and_confidence(self) -> "VLMParsedSignal":
-        critical_missing = self._missing_critical_fields()
-        if (self.uncertain_fields or critical_missing) and self.confidence > 0.6:
+        # Missing critical fields only matter above the 0.6 cap; skip the walk otherwise.
+        if self.confidence > 0.6 and (self.uncertain_fields or self._missing_critical_fields()):
             raise ValueError("confidence must be <= 0.6 when uncertain_fields exist or critical fields are missing")
 
-        required_evidence_fields: dict[str, object | None] = {
-            "symbol": self.symbol,
-            "side": self.side.value if self.side else None,
-            "entry.low": self.entry.low,
-            "entry.high": self.entry.high,
-            "manage.reduce_pct": self.manage.reduce_pct,
-            "manage.add_pct": self.manage.add_pct,
-        }
-        for field_path, field_value in required_evidence_fields.items():
+        field_evidence = self.evidence.field_evidence
+        source = self.evidence.source
+        for field_path, field_value in (
+            ("symbol", self.symbol),
+            ("side", self.side),
+            ("entry.low", self.entry.low),
+            ("entry.high", self.entry.high),
+            ("manage.reduce_pct", self.manage.reduce_pct),
+            ("manage.add_pct", self.manage.add_pct),
+        ):
             if field_value is None:
                 continue
-            snippets = self.evidence.field_evidence.get(field_path) or []
-            if not snippets:
+            if not field_evidence.get(field_path):
                 raise ValueError(f"non-null field {field_path} must include evidence.field_evidence")
-            if field_path not in self.evidence.source:
+            if field_path not in source:
                 raise ValueError(f"non-null field {field_path} must include evidence.source")
 
         return self
@@ -190,45 +201,29 @@ class VLMParsedSignal(BaseModel):
             )
 
         if self.kind == VLMKind.NEEDS_MANUAL:
-            return NeedsManual(
-                kind=ParsedKind.NEEDS_MANUAL,
-                raw_text=raw_text,
-                reason=self.notes or "manual review required",
-                missing_fields=self._missing_critical_fields(),
-                timestamp=timestamp,
+            return _needs_manual(
+                raw_text, timestamp, self.notes or "manual review required", self._missing_critical_fields()
             )
 
         if self.kind == VLMKind.ENTRY_SIGNAL:
             missing = self._missing_critical_fields()
             if missing:
-                return NeedsManual(
-                    kind=ParsedKind.NEEDS_MANUAL,
-                    raw_text=raw_text,
-                    reason="incomplete_entry_fields",
-                    missing_fields=missing,
-                    timestamp=timestamp,
-                )
+                return _needs_manual(raw_text, timestamp, "incomplete_entry_fields", missing)
 
             low = self.entry.low if self.entry.low is not None else self.entry.high
             high = self.entry.high if self.entry.high is not None else self.entry.low
             if low is None or high is None:
-                return NeedsManual(
-                    kind=ParsedKind.NEEDS_MANUAL,
-                    raw_text=raw_text,
-                    reason="incomplete_entry_price",
-                    missing_fields=["entry.low", "entry.high"],
-                    timestamp=timestamp,
-                )
+                return _needs_manual(raw_text, timestamp, "incomplete_entry_price", ["entry.low", "entry.high"])
             if low > high:
                 low, high = high, low
 
-            entry_type = EntryType.MARKET if self.entry.type == "MARKET" else EntryType.LIMIT
+            entry_type = _ENTRY_TYPE_MAP.get(self.entry.type, EntryType.LIMIT)
             return EntrySignal(
                 kind=ParsedKind.ENTRY_SIGNAL,
                 raw_text=raw_text,
                 symbol=str(self.symbol),
                 quote="USDT",
-                side=Side(str(self.side.value)),
+                side=_SIDE_MAP[self.side],
                 leverage=self.leverage,
                 entry_type=entry_type,
                 entry_low=float(low),
@@ -258,13 +253,7 @@ class VLMParsedSignal(BaseModel):
             or tp_price is not None
         )
         if not has_manage:
-            return NeedsManual(
-                kind=ParsedKind.NEEDS_MANUAL,
-                raw_text=raw_text,
-                reason="incomplete_manage_fields",
-                missing_fields=["manage"],
-                timestamp=timestamp,
-            )
+            return _needs_manual(raw_text, timestamp, "incomplete_manage_fields", ["manage"])
         return ManageAction(
             kind=ParsedKind.MANAGE_ACTION,
             raw_text=raw_text,
@@ -278,10 +267,13 @@ class VLMParsedSignal(BaseModel):
         )
 
 
+# Schemas are static; callers must treat the returned dicts as read-only.
+@cache
 def get_vlm_json_schema() -> dict:
     return VLMParsedSignal.model_json_schema()
 
 
+@cache
 def get_vlm_response_format(name: str = "vlm_signal_parser") -> dict:
     return {
         "type": "json_schema",
@@ -291,6 +283,16 @@ def get_vlm_response_format(name: str = "vlm_signal_parser") -> dict:
     }
 
 
+def _needs_manual(raw_text: str, timestamp: datetime | None, reason: str, missing: list[str]) -> NeedsManual:
+    return NeedsManual(
+        kind=ParsedKind.NEEDS_MANUAL,
+        raw_text=raw_text,
+        reason=reason,
+        missing_fields=missing,
+        timestamp=timestamp,
+    )
+
+
 def _infer_reduce_default(raw_text: str) -> float | None:
     if not raw_text:
         return None
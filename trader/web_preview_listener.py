@@ -2,49 +2,67 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import operator
 import re
 import time
 from dataclasses import dataclass
-from datetime import timezone
+from html import unescape
 from typing import Awaitable, Callable
 
 import requests
 try:
     from bs4 import BeautifulSoup
+    import soupsieve
 except Exception:  # noqa: BLE001
     BeautifulSoup = None  # type: ignore[assignment]
+    soupsieve = None  # type: ignore[assignment]
+try:
+    import lxml  # noqa: F401  # optional C tree builder for BeautifulSoup
+except ImportError:
+    _BS_FEATURES = "html.parser"
+else:
+    _BS_FEATURES = "lxml"
 
 from trader.config import ListenerConfig
 from trader.models import TelegramEvent, utc_now
+from trader.rate_limiter import exponential_backoff_seconds
 
 PHOTO_URL_RE = re.compile(r"url\((['\"]?)(?P<url>[^)'\"]+)\1\)")
 POST_OPEN_RE = re.compile(
     r"<div[^>]*class=\"tgme_widget_message\"[^>]*data-post=\"(?P<post>[^\"]+)\"[^>]*>",
-    re.IGNORECASE,
+    re.IGNORECASE | re.ASCII,
 )
 TEXT_RE = re.compile(
     r"<div[^>]*class=\"[^\"]*tgme_widget_message_text[^\"]*\"[^>]*>(?P<text>.*?)</div>",
-    re.DOTALL | re.IGNORECASE,
+    re.DOTALL | re.IGNORECASE | re.ASCII,
 )
 PHOTO_RE = re.compile(
     r"class=\"[^\"]*tgme_widget_message_photo_wrap[^\"]*\"[^>]*style=\"(?P<style>[^\"]+)\"",
-    re.IGNORECASE,
+    re.IGNORECASE | re.ASCII,
 )
 TAG_RE = re.compile(r"<[^>]+>")
+# Retries run on a worker thread; the cap keeps max_retries=10 from sleeping for hours.
+_MAX_FETCH_BACKOFF_SECONDS = 60.0
+
+if soupsieve is not None:
+    _POST_SEL = soupsieve.compile("div.tgme_widget_message[data-post]")
+    _TEXT_SEL = soupsieve.compile(".tgme_widget_message_text")
+    _PHOTO_SEL = soupsieve.compile(".tgme_widget_message_photo_wrap")
+    _IMG_SEL = soupsieve.compile("img")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WebPreviewPost:
     message_id: int
     text: str
     image_url: str | None
 
 
-def parse_posts_from_html(html: str) -> list[WebPreviewPost]:
+def parse_posts_from_html(html: str, min_message_id: int | None = None) -> list[WebPreviewPost]:
     posts: list[WebPreviewPost] = []
     if BeautifulSoup is not None:
-        soup = BeautifulSoup(html, "html.parser")
-        for node in soup.select("div.tgme_widget_message[data-post]"):
+        soup = BeautifulSoup(html, _BS_FEATURES)
+        for node in _POST_SEL.select(soup):
             data_post = str(node.get("data-post", ""))
             if "/" not in data_post:
                 continue
@@ -52,45 +70,54 @@ def parse_posts_from_html(html: str) -> list[WebPreviewPost]:
             if not raw_id.isdigit():
                 continue
             message_id = int(raw_id)
+            if min_message_id is not None and message_id <= min_message_id:
+                continue
 
-            text_node = node.select_one(".tgme_widget_message_text")
+            text_node = _TEXT_SEL.select_one(node)
             text = text_node.get_text("\n", strip=True) if text_node else ""
 
             image_url: str | None = None
-            photo_node = node.select_one(".tgme_widget_message_photo_wrap")
+            photo_node = _PHOTO_SEL.select_one(node)
             if photo_node is not None:
                 style = str(photo_node.get("style", ""))
                 match = PHOTO_URL_RE.search(style)
                 if match:
                     image_url = match.group("url").strip()
             if image_url is None:
-                img_node = node.select_one("img")
+                img_node = _IMG_SEL.select_one(node)
                 if img_node is not None:
                     image_url = str(img_node.get("src") or "").strip() or None
 
             posts.append(WebPreviewPost(message_id=message_id, text=text, image_url=image_url))
     else:
-        matches = list(POST_OPEN_RE.finditer(html))
-        for idx, match in enumerate(matches):
+        # Walk matches pairwise and bound the inner searches with pos/endpos, so no
+        # match list or per-post body slice is materialized.
+        matches = POST_OPEN_RE.finditer(html)
+        match = next(matches, None)
+        while match is not None:
+            following = next(matches, None)
             data_post = match.group("post")
             start = match.end()
-            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(html)
-            body = html[start:end]
+            end = following.start() if following is not None else len(html)
+            match = following
             if "/" not in data_post:
                 continue
             _, raw_id = data_post.rsplit("/", 1)
             if not raw_id.isdigit():
                 continue
             message_id = int(raw_id)
+            if min_message_id is not None and message_id <= min_message_id:
+                continue
 
             text = ""
-            text_match = TEXT_RE.search(body)
+            text_match = TEXT_RE.search(html, start, end)
             if text_match:
-                raw_text = TAG_RE.sub("", text_match.group("text"))
+                # TAG_RE.sub stays in C; unescape decodes entities the way bs4's get_text does.
+                raw_text = unescape(TAG_RE.sub("", text_match.group("text")))
                 text = raw_text.replace("\\n", "\n").strip()
 
             image_url = None
-            photo_match = PHOTO_RE.search(body)
+            photo_match = PHOTO_RE.search(html, start, end)
             if photo_match:
                 style = photo_match.group("style")
                 photo_url_match = PHOTO_URL_RE.search(style)
@@ -99,7 +126,8 @@ def parse_posts_from_html(html: str) -> list[WebPreviewPost]:
 
             posts.append(WebPreviewPost(message_id=message_id, text=text, image_url=image_url))
 
-    posts.sort(key=lambda item: item.message_id)
+    # Timsort is a single linear pass over the usual already-ascending DOM order.
+    posts.sort(key=operator.attrgetter("message_id"))
     return posts
 
 
@@ -110,13 +138,25 @@ class WebPreviewListener:
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": self.config.user_agent})
         self._last_seen_message_id: int | None = None
+        # Validators from the last 200 response; a 304 means nothing new to parse.
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        # Servers without validators mostly resend identical pages; reuse that parse.
+        self._last_html: str | None = None
+        self._last_posts: list[WebPreviewPost] = []
 
     async def run(self, on_event: Callable[[TelegramEvent], Awaitable[None]]) -> None:
         while True:
             try:
                 posts = await asyncio.to_thread(self._fetch_posts)
                 if posts:
-                    await self._emit_new_posts(posts, on_event)
+                    try:
+                        await self._emit_new_posts(posts, on_event)
+                    except Exception:
+                        # Drop the validators so the next poll re-fetches this page
+                        # (instead of a 304) and retries the posts not yet emitted.
+                        self._etag = self._last_modified = None
+                        raise
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # noqa: BLE001
@@ -146,27 +186,44 @@ class WebPreviewListener:
             message_id=post.message_id,
             text=post.text,
             is_edit=False,
-            date=utc_now().astimezone(timezone.utc),
+            date=utc_now(),
             image_url=post.image_url,
             source="web_preview",
         )
 
     def _fetch_posts(self) -> list[WebPreviewPost]:
         html = self._fetch_page()
-        return parse_posts_from_html(html)
-
-    def _fetch_page(self) -> str:
+        if html is None:
+            return []
+        if html != self._last_html:
+            self._last_posts = parse_posts_from_html(html, min_message_id=self._last_seen_message_id)
+            self._last_html = html
+        return self._last_posts
+
+    def _fetch_page(self) -> str | None:
+        headers: dict[str, str] = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
         backoff = self.config.backoff_seconds
         last_error: Exception | None = None
         for attempt in range(self.config.max_retries + 1):
             try:
-                response = self.session.get(self.config.target_url, timeout=self.config.request_timeout_seconds)
+                response = self.session.get(
+                    self.config.target_url,
+                    headers=headers,
+                    timeout=self.config.request_timeout_seconds,
+                )
+                if response.status_code == 304:
+                    return None
                 response.raise_for_status()
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
                 return response.text
             except Exception as exc:  # noqa: BLE001
                 last_error = exc
                 if attempt >= self.config.max_retries:
                     break
-                sleep_seconds = backoff * (2**attempt)
-                time.sleep(sleep_seconds)
+                time.sleep(exponential_backoff_seconds(attempt, backoff, _MAX_FETCH_BACKOFF_SECONDS))
         raise RuntimeError(f"failed to fetch {self.config.target_url}: {last_error}")